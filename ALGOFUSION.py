@@ -1,12 +1,92 @@
 import streamlit as st  # Importation de Streamlit pour créer l'interface utilisateur
 from search_engine import SearchEngine  # Importation du moteur de recherche
-from huffman import calculate_frequency, build_huffman_tree, generate_codes, compress, decompress,plot_huffman_tree  # Importation des fonctions de compression Huffman
-from dij_app import dijkstra, draw_graph, generate_random_graph  # Importation de l'algorithme de Dijkstra et de la fonction pour dessiner le graphe
+from huffman import calculate_frequency, build_codes, compress_bytes, decompress_bytes, render_huffman_tree  # Importation des fonctions de compression Huffman
+from dij_app import CSRGraph, dijkstra, distance_matrix, draw_graph, generate_random_graph, generate_sparse_graph, shortest_path  # Importation de l'algorithme de Dijkstra et de la fonction pour dessiner le graphe
 import tempfile  # Pour créer un fichier temporaire
-import matplotlib.pyplot as plt  # Pour dessiner le graphe avec matplotlib
 import time  # Pour mesurer le temps d'exécution de l'algorithme
 import pandas as pd # Importation de pandas pour la création du tableau
-import networkx as nx
+import hashlib  # Pour identifier les fichiers téléchargés par leur contenu
+import sys  # Pour estimer la taille des objets mis en cache
+from cache import MISSING, LRUCache  # Cache partagé borné en mémoire
+from instrumentation import Metrics  # Pour le panneau de performance (mesures optionnelles)
+
+# --- Cache entre les exécutions du script ---
+# Chaque interaction relance tout le script : les structures coûteuses (index, codec Huffman, graphes)
+# sont construites une fois par contenu et paramètres, puis partagées entre exécutions et sessions.
+# Un seul cache LRU borné en mémoire les regroupe : chaque entrée est enregistrée avec sa taille estimée
+# (nbytes), et les moins récentes sont évincées dès que le budget est dépassé, quel que soit leur type.
+CACHE_MAX_ENTRIES = 32  # Entrées conservées au plus, tous types confondus
+CACHE_MAX_BYTES = 512 * 2**20  # Budget mémoire du cache (octets, estimation)
+CACHE_TTL = 3600  # Durée de vie d'une entrée, en secondes
+CODEC_SYMBOL_BYTES = 400  # Estimation par symbole d'un codec Huffman (fréquence, nœud de l'arbre, code)
+PREVIEW_CHARS = 2000  # Caractères du texte (et codes correspondants) envoyés au navigateur
+
+@st.cache_resource
+def resource_cache():
+    # Créé une fois par processus Streamlit (le script est réexécuté, pas ce cache)
+    return LRUCache(CACHE_MAX_ENTRIES, CACHE_TTL, max_bytes=CACHE_MAX_BYTES)
+
+def cached(kind, key, build, size, spinner=None):
+    # Valeur en cache, sinon construite par build() puis enregistrée avec sa taille size(valeur)
+    cache = resource_cache()
+    value = cache.get((kind, key))
+    if value is MISSING:
+        if spinner:
+            with st.spinner(spinner):
+                value = build()
+        else:
+            value = build()
+        cache.put((kind, key), value, size=size(value))
+    return value
+
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+def build_search_engine(files_hash, files, metrics=None):
+    # Moteur partagé par toutes les sessions : les mesures sont passées à chaque appel, jamais stockées dans le moteur
+    def build():
+        search_engine = SearchEngine()
+        for name, data in files:
+            search_engine.index_document(name, data.decode("utf-8"), metrics=metrics)  # Indexer le contenu du fichier (mesuré à la construction seulement)
+        return search_engine
+    return cached("search", files_hash, build, lambda search_engine: search_engine.nbytes, "Indexation des fichiers...")
+
+def build_huffman_codec(text_hash, text, metrics=None):
+    def build():
+        frequencies = calculate_frequency(text, metrics=metrics)
+        # Codes canoniques : ceux qu'enregistre le fichier compressé (tableau, contenu compressé et arbre affichés
+        # décrivent donc exactement le fichier téléchargé)
+        codes = build_codes(frequencies, metrics)
+        compressed_size_bits = sum(frequencies[char] * len(codes[char]) for char in frequencies)
+        # Aperçus tronqués calculés une seule fois : la page n'envoie jamais le texte complet ni tous ses codes
+        preview = text[:PREVIEW_CHARS]
+        compressed_preview = ' '.join(codes[char] for char in preview)
+        original_bytes = len(text.encode('utf-8'))
+        return (frequencies, codes, compressed_size_bits, compress_bytes(text, codes, metrics=metrics),
+                preview, compressed_preview, original_bytes)
+    return cached("huffman", text_hash, build,
+                  lambda codec: len(codec[3]) + len(codec[4]) + len(codec[5]) + CODEC_SYMBOL_BYTES * len(codec[0]),
+                  "Construction du codage de Huffman...")
+
+def build_random_graph(num_nodes, seed):
+    def build():
+        node_names, graph = generate_random_graph(num_nodes, seed)
+        return node_names, graph, CSRGraph.from_dict(graph)  # Version CSR pour les calculs, convertie une seule fois
+    size = lambda value: value[2].nbytes + sum(sys.getsizeof(neighbors) for neighbors in value[1].values())
+    return cached("random_graph", (num_nodes, seed), build, size)
+
+def build_sparse_graph(num_nodes, degree, kind, seed):
+    def build():
+        graph = generate_sparse_graph(num_nodes, degree, kind, seed)
+        graph.reverse()  # Graphe transposé de la recherche bidirectionnelle, calculé une fois
+        return graph
+    size = lambda graph: (graph.nbytes + graph.reverse().nbytes
+                          + (graph.coordinates.nbytes if graph.coordinates is not None else 0))
+    return cached("sparse_graph", (num_nodes, degree, kind, seed), build, size, "Génération du graphe...")
 
 st.sidebar.image('file (1).png', width=100)
 st.markdown(
@@ -31,6 +111,14 @@ st.markdown(
 st.sidebar.title("Choisissez une fonction")  # Titre de la barre latérale
 option = st.sidebar.selectbox("OPTIONS", ["PAGE D'ACCUEIL", "MOTEUR DE RECHERCHE", "COMPRESSION DE FICHIERS", "ALGORITHME DE DIJKSTRA"])  # Choix entre différentes options
 
+# Mesures de performance : désactivées par défaut (metrics = None, aucun coût de mesure),
+# cumulées sur la session quand elles sont activées, jusqu'à réinitialisation
+metrics = None
+if st.sidebar.checkbox("Mesures de performance"):
+    if "metrics" not in st.session_state:
+        st.session_state.metrics = Metrics()
+    metrics = st.session_state.metrics
+
 # --- Page d'accueil ---
 if option == "PAGE D'ACCUEIL":
     st.image("logo_algo.jpg", use_container_width=False, width=3000, caption=None)
@@ -70,12 +158,13 @@ elif option == "MOTEUR DE RECHERCHE":
     """)
 
     uploaded_files = st.file_uploader("Téléchargez vos fichiers texte (.txt)", type=["txt"], accept_multiple_files=True)  # Permet à l'utilisateur de télécharger plusieurs fichiers texte
-    search_engine = SearchEngine()  # Initialisation du moteur de recherche
+    search_engine = SearchEngine()  # Moteur vide tant qu'aucun fichier n'est téléchargé
 
     if uploaded_files:  # Si des fichiers sont téléchargés
-        for uploaded_file in uploaded_files:
-            content = uploaded_file.read().decode("utf-8")  # Lire le contenu du fichier et le décoder en texte
-            search_engine.index_document(uploaded_file.name, content)  # Indexer le contenu du fichier
+        # Index réutilisé tant que les mêmes fichiers (noms et contenus) sont téléchargés
+        files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+        files_hash = content_hash(*(part for name, data in files for part in (name.encode("utf-8"), data)))
+        search_engine = build_search_engine(files_hash, files, metrics)
         st.success(f"{len(uploaded_files)} fichier(s) indexé(s).")  # Afficher un message de succès
 
     query = st.text_input("Entrez votre requête :")  # Demander à l'utilisateur de saisir une requête
@@ -84,7 +173,7 @@ elif option == "MOTEUR DE RECHERCHE":
 
     if st.button("Rechercher"):  # Si l'utilisateur appuie sur le bouton de recherche
         if query:  # Si une requête a été saisie
-            results = search_engine.search(query, operator=operator, fuzzy=fuzzy)  # Effectuer la recherche
+            results = search_engine.search(query, operator=operator, fuzzy=fuzzy, metrics=metrics)  # Effectuer la recherche
             if results:  # Si des résultats sont trouvés
                 st.write("Documents trouvés :")
                 for result in results:
@@ -97,27 +186,24 @@ elif option == "COMPRESSION DE FICHIERS":
     st.title("**COMPRESSION DE DONNEES AVEC L'ALGORITHME DE HUFFMAN**")
     uploaded_file = st.file_uploader("Téléchargez un fichier texte", type=["txt"])
     if uploaded_file:
-        text = uploaded_file.read().decode("utf-8")
-        st.write("Contenu du fichier :")
-        st.text_area("Texte brut", text, height=200)
+        text = uploaded_file.getvalue().decode("utf-8")
+        # Compression Huffman (table, codes canoniques, fichier compressé et aperçus mis en cache par contenu)
+        (frequencies, codes, compressed_size_bits, compressed_file,
+         preview, compressed_preview, original_bytes) = build_huffman_codec(content_hash(uploaded_file.getvalue()), text, metrics)
+        preview_note = f" ({len(preview)} premiers caractères sur {len(text)})" if len(text) > len(preview) else ""
 
-        # Compression Huffman
-        frequencies = calculate_frequency(text)
-        huffman_tree = build_huffman_tree(frequencies)
-        codes = generate_codes(huffman_tree)
-        compressed_data = compress(text, codes)
+        st.write("Contenu du fichier" + preview_note + " :")
+        st.text_area("Texte brut", preview, height=200)
 
         # Affichage des tailles avant et après compression
         original_size = len(text) * 8
-        compressed_size_bits = sum(len(codes[char]) for char in text)
         st.write(f"Taille originale : {original_size} bits")
         st.write(f"Taille compressée : {compressed_size_bits} bits")
         st.write(f"Taux de compression : {compressed_size_bits / original_size:.4f}")
 
         # Affichage des données compressées
-        compressed_data_with_spaces = ' '.join([codes[char] for char in text])
-        st.write("Contenu compressé :")
-        st.text_area("Données compressées (binaire, avec espaces)", compressed_data_with_spaces, height=200)
+        st.write("Contenu compressé" + preview_note + " :")
+        st.text_area("Données compressées (binaire, avec espaces)", compressed_preview, height=200)
 
         # Table des lettres, fréquences et codes
         table_data = {
@@ -129,50 +215,26 @@ elif option == "COMPRESSION DE FICHIERS":
         st.write("### Tableau des lettres, fréquences et codes Huffman :")
         st.dataframe(df)
 
-        # Téléchargement du fichier compressé
+        # Téléchargement du fichier compressé (format binaire : table des codes + bits empaquetés)
+        st.write(f"Taille du fichier compressé : {len(compressed_file)} octets (original : {original_bytes} octets)")
         st.download_button(
             label="Télécharger le fichier compressé",
-            data=compressed_data_with_spaces,
+            data=compressed_file,
             file_name=f"{uploaded_file.name}.bin",
             mime="application/octet-stream"
         )
 
         # Décompression
         if st.button("Décompresser"):
-            decompressed_text = decompress(compressed_data.replace(" ", ""), huffman_tree)
-            st.text_area("Texte décompressé", decompressed_text, height=200)
+            decompressed_text = decompress_bytes(compressed_file, metrics)
+            st.write("Décompression " + ("exacte" if decompressed_text == text else "incorrecte") + preview_note + " :")
+            st.text_area("Texte décompressé", decompressed_text[:PREVIEW_CHARS], height=200)
 
 
-        # Visualisation de l'arbre de Huffman
+        # Visualisation de l'arbre de Huffman : disposition calculée et dessinée une seule fois par table de codes
+        # (image en cache), sous-arbres les plus légers repliés au-delà de TREE_DRAW_LEAF_LIMIT feuilles
         st.write("### Arbre de Huffman :")
-        graph, pos, leaf_positions = plot_huffman_tree(huffman_tree)  # Correction ici
-
-        # Placer les feuilles en bas dans l'ordre croissant des fréquences
-        sorted_leaves = sorted(frequencies.items(), key=lambda item: item[1])
-        leaf_x = 0
-        for char, _ in sorted_leaves:
-        # Ajuster les positions des feuilles pour qu'elles soient alignées horizontalement
-         leaf_positions[char] = (leaf_x, -2)  # Placer les feuilles à y = -2
-         leaf_x += 1  # Décaler les feuilles à gauche -> droite
-
-      # Dessiner l'arbre avec Matplotlib
-        plt.figure(figsize=(10, 8))
-        nx.draw(graph, pos, with_labels=True, node_size=2000, node_color="#9b111e", edge_color="gray", font_size=10, font_weight="bold")
-
-     # Ajouter les étiquettes des arêtes (0 pour gauche, 1 pour droite)
-        edge_labels = {(u, v): d['label'] for u, v, d in graph.edges(data=True)}  # Récupérer les étiquettes des arêtes
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=12, font_color="#9b111e")  # Affichage des étiquettes
-
-# Placer les feuilles à leurs positions définies
-        for char, (x, y) in leaf_positions.items():
-         pos[char] = (x, y)  # Mettre à jour les positions des feuilles
-
-# Redessiner les nœuds avec les nouvelles positions des feuilles
-         nx.draw(graph, pos, with_labels=True, node_size=2000, node_color="#9b111e", edge_color="gray", font_size=10, font_weight="bold")
-
-# Titre et affichage dans Streamlit
-        plt.title("Arbre de Huffman avec étiquettes 0 et 1")
-        st.pyplot(plt)
+        st.image(render_huffman_tree(codes, frequencies, metrics=metrics))
 
 
     
@@ -183,21 +245,23 @@ elif option == "ALGORITHME DE DIJKSTRA":
     # Choix du mode de création du graphe
     choix = st.radio(
         "Comment souhaitez-vous définir les nœuds et les distances ?",
-        ("Générer aléatoirement", "Entrer manuellement")
+        ("Générer aléatoirement", "Entrer manuellement", "Graphe creux (grande taille)")
     )  # Choisir entre générer un graphe aléatoire ou entrer les données manuellement
     
     # Initialisation du graphe et des nœuds
     graph = {}
+    csr_graph = None  # Version CSR du graphe quand elle est déjà en cache
     node_names = []
     if choix == "Générer aléatoirement":  # Si l'utilisateur choisit de générer un graphe aléatoire
         num_nodes = st.number_input("Nombre de nœuds", min_value=2, step=1, key="num_nodes_random")  # Demander le nombre de nœuds
+        seed = st.number_input("Graine du tirage", min_value=0, step=1, key="seed_random")  # Même graine = même graphe
         
         if num_nodes:  # Si un nombre de nœuds est saisi
-            node_names, graph = generate_random_graph(num_nodes)  # Générer le graphe aléatoire
+            node_names, graph, csr_graph = build_random_graph(num_nodes, seed)  # Générer le graphe aléatoire (en cache)
             st.success(f"Un graphe avec {num_nodes} nœuds a été généré aléatoirement.")  # Afficher un message de succès
-            draw_graph(graph)  # Afficher le graphe
+            draw_graph(csr_graph)  # Afficher le graphe (disposition en cache)
 
-    else:  # Si l'utilisateur choisit de définir les distances manuellement
+    elif choix == "Entrer manuellement":  # Si l'utilisateur choisit de définir les distances manuellement
         num_nodes = st.number_input("Nombre de nœuds", min_value=2, step=1, key="num_nodes_manual")  # Demander le nombre de nœuds
         
         if num_nodes:  # Si un nombre de nœuds est saisi
@@ -217,6 +281,28 @@ elif option == "ALGORITHME DE DIJKSTRA":
                         graph[node_names[j]][node_names[i]] = distance  # Ajouter la distance dans l'autre sens
             draw_graph(graph)  # Afficher le graphe
 
+    elif choix == "Graphe creux (grande taille)":  # Jusqu'à plusieurs millions d'arêtes, nœuds numérotés
+        num_nodes = st.number_input("Nombre de nœuds", min_value=2, max_value=5_000_000, value=10_000, step=1000, key="num_nodes_sparse")
+        degree = st.number_input("Degré moyen", min_value=1.0, max_value=50.0, value=4.0, step=1.0, key="degree_sparse")
+        kind = st.selectbox("Type de graphe", ["erdos_renyi", "geometric"], key="kind_sparse")
+        seed = st.number_input("Graine du tirage", min_value=0, step=1, key="seed_sparse")
+        graph = build_sparse_graph(int(num_nodes), degree, kind, int(seed))
+        st.success(f"Graphe de {graph.num_nodes} nœuds et {graph.num_edges // 2} arêtes généré.")
+        draw_graph(graph)  # Au-delà de DRAW_NODE_LIMIT nœuds, un échantillon est dessiné ; au-delà de DRAW_EDGE_LIMIT arêtes, aucun dessin
+
+        start_id = st.number_input("Nœud de départ", min_value=0, max_value=graph.num_nodes - 1, step=1, key="start_sparse")
+        end_id = st.number_input("Nœud d'arrivée", min_value=0, max_value=graph.num_nodes - 1, value=graph.num_nodes - 1, step=1, key="end_sparse")
+        if st.button("Calculer le plus court chemin", key="path_sparse"):
+            start_time = time.time()
+            distance, path = shortest_path(graph, int(start_id), int(end_id), metrics=metrics)  # Dijkstra bidirectionnel, arrêt anticipé
+            execution_time = time.time() - start_time
+            if not path:
+                st.error(f"Aucun chemin disponible entre {start_id} et {end_id}.")
+            else:
+                st.success(f"Distance totale : {distance:g} unités, chemin de {len(path)} nœuds.")
+                st.write(" -> ".join(map(str, path[:200])) + (" -> ..." if len(path) > 200 else ""))
+            st.write(f"Calculé en {execution_time:.4f} secondes.")
+
     # Choisir un nœud de départ et d'arrivée
     if node_names:
         start_node = st.selectbox("Choisissez le nœud de départ", node_names, key="start_node")  # Sélectionner le nœud de départ
@@ -230,7 +316,7 @@ elif option == "ALGORITHME DE DIJKSTRA":
             initial_distances[start_node] = 0  # La distance du nœud de départ est 0
 
             # Exécution de l'algorithme de Dijkstra
-            dist, path = dijkstra(graph, start_node, end_node)  # Appliquer l'algorithme de Dijkstra
+            dist, path = dijkstra(csr_graph or graph, start_node, end_node, metrics)  # Appliquer l'algorithme de Dijkstra
             
             execution_time = time.time() - start_time  # Temps écoulé
             
@@ -255,6 +341,30 @@ elif option == "ALGORITHME DE DIJKSTRA":
             st.write(f"### Temps d'exécution de l'algorithme de Dijkstra :")
             st.write(f"{execution_time:.4f} secondes.")
 
+        if st.button("Calculer la matrice des distances"):  # Toutes les paires en un seul calcul
+            start_time = time.time()
+            matrix = distance_matrix(csr_graph or graph, node_names, node_names)
+            execution_time = time.time() - start_time
+            st.write("### Matrice des distances minimales :")
+            st.dataframe(pd.DataFrame(matrix, index=node_names, columns=node_names))
+            st.write(f"Calculée en {execution_time:.4f} secondes.")
+
+# --- Panneau de performance ---
+if metrics is not None:
+    with st.sidebar.expander("Performance", expanded=True):
+        if st.button("Réinitialiser les mesures"):
+            metrics.reset()
+        snapshot = metrics.snapshot()
+        if snapshot["phases"]:
+            st.dataframe(pd.DataFrame([{"Phase": name, "Durée (ms)": values["seconds"] * 1000, "Appels": values["calls"]}
+                                       for name, values in sorted(snapshot["phases"].items())]), hide_index=True)
+        if snapshot["counters"]:
+            st.dataframe(pd.DataFrame([{"Compteur": name, "Valeur": value}
+                                       for name, value in sorted(snapshot["counters"].items())]), hide_index=True)
+        if not snapshot["phases"] and not snapshot["counters"]:
+            st.write("Aucune mesure pour l'instant.")
+        st.download_button("Exporter (JSON)", metrics.to_json(), file_name="metrics.json", mime="application/json")
+
 st.markdown("""
     <style>
     /* Style pour le pied de page */
@@ -0,0 +1,227 @@
+# Point d'entrée en ligne de commande, sans interface Streamlit : indexation, recherche, compression et itinéraires
+# dans des scripts, des tâches planifiées ou des chaînes de traitement.
+# Utilisation :
+#   python -m algofusion_cli index DOSSIER INDEX [--positional]
+#   python -m algofusion_cli search INDEX [REQUÊTE ...] [--operator OU] [--fuzzy] [--top-k 10]   (requêtes lues sur stdin si absentes)
+#   python -m algofusion_cli compress ENTRÉE SORTIE       (fichier ou dossier parcouru récursivement ; - pour stdin/stdout)
+#   python -m algofusion_cli decompress ENTRÉE SORTIE
+#   python -m algofusion_cli route GRAPHE [DÉPART ARRIVÉE] [--pairs FICHIER] [--hierarchy FICHIER]
+# Chaque sous-commande n'importe que les modules dont elle a besoin : le démarrage reste rapide.
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+def _iter_lines(values, stream):
+    # Valeurs passées en arguments, sinon une par ligne sur le flux (lignes vides ignorées)
+    if values:
+        yield from values
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+def _stdout_text():
+    return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=True)
+
+def command_index(args):
+    from search_engine import SearchEngine
+    engine = SearchEngine(positional=args.positional)
+    count = 0
+    for root, _, file_names in os.walk(args.folder):
+        for file_name in sorted(file_names):
+            path = os.path.join(root, file_name)
+            with open(path, "r", encoding="utf-8", errors="replace") as handle:
+                engine.index_document(os.path.relpath(path, args.folder), handle.read())
+            count += 1
+    engine.save(args.index)
+    print(f"{count} document(s) indexé(s) dans {args.index}", file=sys.stderr)
+
+def command_search(args):
+    from search_engine import SearchEngine
+    engine = SearchEngine.open(args.index)
+    # Une ligne JSON par requête : {"query": ..., "results": [...]}
+    for query in _iter_lines(args.queries, sys.stdin):
+        results = engine.search(query, operator=args.operator, fuzzy=args.fuzzy, top_k=args.top_k)
+        print(json.dumps({"query": query, "results": results}, ensure_ascii=False), flush=True)
+
+COMPRESSED_SUFFIX = ".huf"
+
+def _transform_paths(source, destination, rename, transform):
+    # Fichier -> fichier, ou dossier -> dossier (un fichier de sortie par fichier d'entrée, nommé par rename)
+    # Le dossier est parcouru récursivement comme pour index : ses sous-dossiers sont reproduits dans la destination
+    if os.path.isdir(source):
+        output_folder = os.path.abspath(destination)
+        for root, folders, file_names in os.walk(source):
+            # Ne pas redescendre dans la destination si elle se trouve dans le dossier source
+            folders[:] = sorted(folder for folder in folders if os.path.abspath(os.path.join(root, folder)) != output_folder)
+            target = os.path.normpath(os.path.join(destination, os.path.relpath(root, source)))
+            os.makedirs(target, exist_ok=True)
+            for file_name in sorted(file_names):
+                transform(os.path.join(root, file_name), os.path.join(target, rename(file_name)))
+    else:
+        transform(source, destination)
+
+def _compress_file(source, destination):
+    from huffman import compress_stream
+    if source == "-":
+        # stdin n'est pas relisible : copie dans un fichier temporaire pour le comptage des fréquences
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as spool:
+            shutil.copyfileobj(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline=""), spool)
+            spool.seek(0)
+            _compress_handle(compress_stream, spool, destination)
+    else:
+        with open(source, "r", encoding="utf-8", newline="") as handle:
+            _compress_handle(compress_stream, handle, destination)
+
+def _compress_handle(compress_stream, handle, destination):
+    if destination == "-":
+        compress_stream(handle, sys.stdout.buffer)
+    else:
+        with open(destination, "wb") as output:
+            compress_stream(handle, output)
+
+def _decompress_file(source, destination):
+    from huffman import decompress_stream
+    handle = sys.stdin.buffer if source == "-" else open(source, "rb")
+    output = _stdout_text() if destination == "-" else open(destination, "w", encoding="utf-8", newline="")
+    try:
+        decompress_stream(handle, output)
+    finally:
+        if handle is not sys.stdin.buffer:
+            handle.close()
+        if destination == "-":
+            output.detach()
+        else:
+            output.close()
+
+def command_compress(args):
+    _transform_paths(args.source, args.destination, lambda name: name + COMPRESSED_SUFFIX, _compress_file)
+
+def command_decompress(args):
+    # Retirer l'extension ajoutée à la compression
+    rename = lambda name: name[:-len(COMPRESSED_SUFFIX)] if name.endswith(COMPRESSED_SUFFIX) else name + ".out"
+    _transform_paths(args.source, args.destination, rename, _decompress_file)
+
+def load_edge_list(path, directed=False):
+    # Une arête par ligne : « départ arrivée poids » (séparés par des espaces ; # pour les commentaires)
+    from dij_app import CSRGraph
+    names, ids = [], {}
+    sources, targets, weights = [], [], []
+    handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in handle:
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            for name in fields[:2]:
+                if name not in ids:
+                    ids[name] = len(names)
+                    names.append(name)
+            sources.append(ids[fields[0]])
+            targets.append(ids[fields[1]])
+            weights.append(float(fields[2]) if len(fields) > 2 else 1.0)
+    finally:
+        if handle is not sys.stdin:  # stdin reste ouvert pour la suite du traitement
+            handle.close()
+    if not directed:
+        sources, targets, weights = sources + targets, targets + sources, weights + weights
+    graph = CSRGraph.from_edges(sources, targets, weights, len(names), names)
+    graph._ids = ids
+    return graph
+
+def command_route(args):
+    from dij_app import shortest_path
+    pairs_from_stdin = not args.endpoints and args.pairs in (None, "-")
+    if args.graph == "-" and pairs_from_stdin:
+        raise SystemExit("route : le graphe et les paires ne peuvent pas être lus tous les deux sur stdin (utiliser --pairs)")
+    graph = load_edge_list(args.graph, args.directed)
+    if args.hierarchy:
+        # Hiérarchie de contraction : chargée si le fichier existe et correspond au graphe (empreinte des arêtes,
+        # des poids et des noms, donc aussi du mode --directed), sinon construite puis enregistrée
+        from contraction import ContractionHierarchy
+        hierarchy = ContractionHierarchy.load(args.hierarchy) if os.path.exists(args.hierarchy) else None
+        if hierarchy is not None and not hierarchy.matches(graph):
+            print(f"route : {args.hierarchy} ne correspond pas à ce graphe, reconstruction", file=sys.stderr)
+            hierarchy = None
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.build(graph)
+            hierarchy.save(args.hierarchy)
+        route = hierarchy.shortest_path
+    else:
+        route = lambda start, end: shortest_path(graph, start, end, method=args.method)
+    if args.endpoints:
+        if len(args.endpoints) != 2:
+            raise SystemExit("route : indiquer exactement un départ et une arrivée (ou --pairs)")
+        errors = _route_pairs(route, [" ".join(args.endpoints)])
+    elif pairs_from_stdin:
+        errors = _route_pairs(route, _iter_lines(None, sys.stdin))
+    else:
+        with open(args.pairs, "r", encoding="utf-8") as handle:
+            errors = _route_pairs(route, _iter_lines(None, handle))
+    if errors:
+        raise SystemExit(f"route : {errors} paire(s) ignorée(s)")
+
+def _route_pairs(route, pairs):
+    # Une ligne par paire : départ, arrivée, distance (inf si aucun chemin) et chemin, séparés par des tabulations.
+    # Une paire invalide (un seul nœud, nœud inconnu) est signalée sur stderr sans interrompre le lot.
+    errors = 0
+    for pair in pairs:
+        fields = pair.split()
+        if len(fields) < 2:
+            print(f"route : paire invalide (départ et arrivée attendus) : {pair!r}", file=sys.stderr)
+            errors += 1
+            continue
+        start, end = fields[:2]
+        try:
+            distance, path = route(start, end)
+        except KeyError as error:
+            print(f"route : nœud inconnu {error.args[0]!r} dans la paire {pair!r}", file=sys.stderr)
+            errors += 1
+            continue
+        print(f"{start}\t{end}\t{distance:g}\t{' -> '.join(map(str, path))}", flush=True)
+    return errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="algofusion_cli", description="ALGOFUSION en ligne de commande")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="Indexer les fichiers texte d'un dossier dans un segment")
+    index.add_argument("folder", help="Dossier de documents (parcouru récursivement)")
+    index.add_argument("index", help="Fichier segment à écrire")
+    index.add_argument("--positional", action="store_true", help="Index positionnel (expressions exactes, NEAR/k)")
+    index.set_defaults(function=command_index)
+
+    search = commands.add_parser("search", help="Rechercher dans un segment (une ligne JSON par requête)")
+    search.add_argument("index", help="Fichier segment")
+    search.add_argument("queries", nargs="*", help="Requêtes (sinon lues sur stdin, une par ligne)")
+    search.add_argument("--operator", choices=["ET", "OU"], default="ET")
+    search.add_argument("--fuzzy", action="store_true", help="Recherche floue")
+    search.add_argument("--top-k", type=int, default=None, help="Nombre maximal de résultats par requête")
+    search.set_defaults(function=command_search)
+
+    for name, function, help_text in (("compress", command_compress, "Compresser un fichier texte ou un dossier"),
+                                      ("decompress", command_decompress, "Décompresser un fichier ou un dossier")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("source", help="Fichier, dossier (parcouru récursivement) ou - (stdin)")
+        command.add_argument("destination", help="Fichier, dossier ou - (stdout)")
+        command.set_defaults(function=function)
+
+    route = commands.add_parser("route", help="Plus courts chemins sur un graphe (liste d'arêtes)")
+    route.add_argument("graph", help="Fichier « départ arrivée poids » par ligne, ou -")
+    route.add_argument("endpoints", nargs="*", help="Départ et arrivée (sinon paires lues dans --pairs ou sur stdin)")
+    route.add_argument("--pairs", help="Fichier de paires « départ arrivée », une par ligne (- : stdin)")
+    route.add_argument("--directed", action="store_true", help="Arêtes orientées (par défaut : non orientées)")
+    route.add_argument("--method", choices=["dijkstra", "bidirectional"], default="bidirectional")
+    route.add_argument("--hierarchy", help="Fichier de hiérarchie de contraction (construit s'il n'existe pas)")
+    route.set_defaults(function=command_route)
+
+    args = parser.parse_args(argv)
+    args.function(args)
+
+if __name__ == "__main__":
+    main()
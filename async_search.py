@@ -0,0 +1,30 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+class AsyncSearchEngine:
+    # Façade asyncio pour SearchEngine : les appels s'exécutent dans un pool de threads,
+    # le verrou lecteurs/rédacteur du moteur garantit des recherches cohérentes pendant l'indexation
+    def __init__(self, engine, max_workers=None):
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def search(self, query, operator="ET", fuzzy=False, top_k=None, metrics=None):
+        return await self._run(self.engine.search, query, operator=operator, fuzzy=fuzzy, top_k=top_k, metrics=metrics)
+
+    async def search_many(self, queries, operator="ET", fuzzy=False, top_k=None, metrics=None):
+        return await self._run(self.engine.search_many, queries, operator=operator, fuzzy=fuzzy, top_k=top_k,
+                               metrics=metrics)
+
+    async def index_document(self, doc_id, content):
+        return await self._run(self.engine.index_document, doc_id, content)
+
+    async def delete_document(self, doc_id):
+        return await self._run(self.engine.delete_document, doc_id)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,50 @@
+# Hiérarchie de contraction : temps de prétraitement, taille de l'index et gain par requête face à Dijkstra
+# Utilisation : python benchmarks/bench_contraction.py --sides 50 100 --queries 100
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_shortest_path import generate_grid_graph
+from contraction import ContractionHierarchy
+from dij_app import dijkstra_csr
+
+def average_ms(function, pairs):
+    start = time.perf_counter()
+    for source, target in pairs:
+        function(source, target)
+    return (time.perf_counter() - start) / len(pairs) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Hiérarchie de contraction vs Dijkstra")
+    parser.add_argument("--sides", type=int, nargs="+", default=[50, 100], help="Côtés des grilles")
+    parser.add_argument("--queries", type=int, default=100, help="Nombre de requêtes par taille")
+    args = parser.parse_args()
+
+    print(f"{'Nœuds':>8} {'Prétrait. (s)':>14} {'Index (Ko)':>11} {'Dijkstra (ms)':>14} {'Arrêt (ms)':>11} {'CH (ms)':>9} {'Gain':>8}")
+    for side in args.sides:
+        graph, _, _ = generate_grid_graph(side)
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.build(graph)
+        build_seconds = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "hierarchy.npz")
+            hierarchy.save(path)
+            index_size = os.path.getsize(path)
+            hierarchy = ContractionHierarchy.load(path)
+
+        rng = np.random.default_rng(1)
+        pairs = [tuple(int(node) for node in rng.integers(graph.num_nodes, size=2)) for _ in range(args.queries)]
+        dijkstra_ms = average_ms(lambda s, t: dijkstra_csr(graph, s), pairs)
+        early_ms = average_ms(lambda s, t: dijkstra_csr(graph, s, t), pairs)
+        hierarchy_ms = average_ms(hierarchy.query, pairs)
+        print(f"{graph.num_nodes:>8} {build_seconds:>14.1f} {index_size / 1024:>11.0f} {dijkstra_ms:>14.2f} "
+              f"{early_ms:>11.2f} {hierarchy_ms:>9.3f} {dijkstra_ms / hierarchy_ms:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
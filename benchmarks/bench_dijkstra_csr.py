@@ -0,0 +1,60 @@
+# Mémoire et temps de Dijkstra : graphe en dictionnaires vs graphe CSR (tableaux NumPy)
+# Utilisation : python benchmarks/bench_dijkstra_csr.py --sizes 10000 100000 --degree 4
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dij_app import CSRGraph, dijkstra_csr, dijkstra_dict
+
+def generate_sparse_graph(num_nodes, degree, seed=0):
+    # Graphe non orienté aléatoire de degré moyen donné, au format dictionnaire historique
+    rng = random.Random(seed)
+    graph = {f"Node{i+1}": {} for i in range(num_nodes)}
+    names = list(graph)
+    for _ in range(num_nodes * degree // 2):
+        a, b = rng.sample(names, 2)
+        weight = rng.randint(1, 10)
+        graph[a][b] = weight
+        graph[b][a] = weight
+    return graph
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    parser = argparse.ArgumentParser(description="Dijkstra : dictionnaires vs CSR")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Nombres de nœuds")
+    parser.add_argument("--degree", type=int, default=4, help="Degré moyen")
+    parser.add_argument("--queries", type=int, default=5, help="Nombre de sources par taille")
+    args = parser.parse_args()
+
+    print(f"{'Nœuds':>10} {'Dict (Mo)':>10} {'CSR (Mo)':>10} {'Dict (ms)':>10} {'CSR (ms)':>10} {'Gain':>7}")
+    for size in args.sizes:
+        graph, dict_bytes = measure_memory(lambda: generate_sparse_graph(size, args.degree))
+        csr = CSRGraph.from_dict(graph)
+        sources = random.Random(1).sample(list(graph), args.queries)
+
+        start = time.perf_counter()
+        for source in sources:
+            dijkstra_dict(graph, source, source)
+        dict_ms = (time.perf_counter() - start) / len(sources) * 1000
+
+        start = time.perf_counter()
+        for source in sources:
+            dijkstra_csr(csr, csr.node_id(source))
+        csr_ms = (time.perf_counter() - start) / len(sources) * 1000
+
+        print(f"{size:>10} {dict_bytes / 1e6:>10.1f} {csr.nbytes / 1e6:>10.1f} "
+              f"{dict_ms:>10.1f} {csr_ms:>10.1f} {dict_ms / csr_ms:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
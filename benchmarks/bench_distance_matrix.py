@@ -0,0 +1,45 @@
+# Matrices de distances : une boucle de dijkstra par source vs distance_matrix (calcul matriciel ou pool de processus)
+# Utilisation : python benchmarks/bench_distance_matrix.py --sizes 500 20000 --sources 64 --workers 4
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dij_app import CSRGraph, dijkstra_csr, distance_matrix
+
+def generate_sparse_graph(num_nodes, degree, seed=0):
+    rng = np.random.default_rng(seed)
+    count = num_nodes * degree // 2
+    sources, targets = rng.integers(num_nodes, size=count), rng.integers(num_nodes, size=count)
+    weights = rng.integers(1, 11, size=count).astype(float)
+    return CSRGraph.from_edges(np.concatenate([sources, targets]), np.concatenate([targets, sources]),
+                               np.concatenate([weights, weights]), num_nodes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrice des distances : boucle vs lot")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 20000], help="Nombres de nœuds")
+    parser.add_argument("--degree", type=int, default=4, help="Degré moyen")
+    parser.add_argument("--sources", type=int, default=64, help="Nombre de sources")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processus du pool")
+    args = parser.parse_args()
+
+    distance_matrix(generate_sparse_graph(10, 2), [0])  # Importer scipy avant de chronométrer
+    print(f"{'Nœuds':>8} {'Boucle (s)':>11} {'Lot (s)':>9} {'Gain':>7}")
+    for size in args.sizes:
+        graph = generate_sparse_graph(size, args.degree)
+        sources = np.random.default_rng(1).choice(size, min(size, args.sources), replace=False).tolist()
+        start = time.perf_counter()
+        expected = np.vstack([dijkstra_csr(graph, source)[0] for source in sources])
+        loop_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        matrix = distance_matrix(graph, sources, workers=args.workers)
+        batch_seconds = time.perf_counter() - start
+        assert np.allclose(matrix, expected)
+        print(f"{size:>8} {loop_seconds:>11.2f} {batch_seconds:>9.2f} {loop_seconds / batch_seconds:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
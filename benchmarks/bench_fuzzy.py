@@ -0,0 +1,58 @@
+# Latence de la recherche floue : index de trigrammes vs parcours difflib du vocabulaire
+# Utilisation : python benchmarks/bench_fuzzy.py --sizes 1000 10000 100000
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from difflib import get_close_matches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy import TrigramIndex, similar_words
+
+def generate_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))))
+    return list(words)
+
+def misspell(word, rng):
+    # Une substitution ou une inversion de deux lettres voisines au hasard : les fautes de frappe typiques
+    if rng.random() < 0.5:
+        position = rng.randrange(len(word) - 1)
+        return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+
+def average_latency(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Recherche floue : trigrammes vs difflib")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Tailles du vocabulaire")
+    parser.add_argument("--queries", type=int, default=20, help="Nombre de requêtes par taille")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'Vocabulaire':>12} {'difflib (ms)':>14} {'Trigrammes (ms)':>16} {'Gain':>8}")
+    for size in args.sizes:
+        words = generate_vocabulary(size)
+        index = TrigramIndex(words)
+        originals = rng.sample(words, args.queries)
+        queries = [misspell(word, rng) for word in originals]
+        # Une seule faute (distance 1) sur un mot d'au moins 5 lettres : similarité >= 0.8, le mot doit être retrouvé
+        for word, query in zip(originals, queries):
+            if len(word) >= 5:
+                assert word in similar_words(index, query, n=len(words)), (word, query)
+        difflib_ms = average_latency(lambda query: get_close_matches(query, words, n=5, cutoff=0.8), queries)
+        trigram_ms = average_latency(lambda query: similar_words(index, query), queries)
+        print(f"{size:>12} {difflib_ms:>14.3f} {trigram_ms:>16.3f} {difflib_ms / trigram_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Comparaison du débit de décompression : parcours bit à bit de l'arbre vs décodage par table
+# Utilisation : python benchmarks/bench_huffman_decode.py --sizes 1 5 10
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from huffman import (build_huffman_tree, build_tree_from_codes, compress_bytes, decode_packed,
+                     decompress, generate_codes, read_header, unpack_bits)
+
+# Texte synthétique : alphabet avec une distribution de Zipf (proche d'un texte réel)
+def generate_text(size, seed=0):
+    rng = random.Random(seed)
+    alphabet = [chr(c) for c in range(32, 127)] + list("éèàçùô\n")
+    weights = [1 / (rank + 1) for rank in range(len(alphabet))]
+    return "".join(rng.choices(alphabet, weights=weights, k=size))
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de décompression Huffman : arbre vs table")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="Tailles de texte en Mo")
+    args = parser.parse_args()
+
+    print(f"{'Taille (Mo)':>12} {'Arbre (Mo/s)':>14} {'Table (Mo/s)':>14} {'Gain':>6}")
+    for size_mb in args.sizes:
+        text = generate_text(int(size_mb * 1_000_000))
+        frequencies = {}
+        for char in text:
+            frequencies[char] = frequencies.get(char, 0) + 1
+        data = compress_bytes(text, generate_codes(build_huffman_tree(frequencies)))
+        _, padding, codes, offset = read_header(data)
+        payload = data[offset:]
+        megabytes = len(text.encode("utf-8")) / 1_000_000
+
+        # Ancien chemin : dépaquetage en '0'/'1' puis parcours de l'arbre bit par bit
+        walked, walker_time = measure(lambda: decompress(unpack_bits(payload, padding), build_tree_from_codes(codes)))
+        decoded, table_time = measure(decode_packed, payload, padding, codes)
+        assert walked == decoded == text
+
+        print(f"{size_mb:>12.1f} {megabytes / walker_time:>14.2f} {megabytes / table_time:>14.2f} "
+              f"{walker_time / table_time:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Charge concurrente sur le moteur de recherche : N clients asyncio interrogent le moteur
+# pendant qu'un rédacteur continue d'indexer ; débit et latences (p50, p95, p99)
+# Utilisation : python benchmarks/bench_search_load.py --clients 100 --requests 20
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_search import AsyncSearchEngine
+from search_engine import SearchEngine
+
+def generate_document(rng, vocabulary, weights):
+    return " ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(20, 200)))
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def client(facade, queries, requests, latencies, rng):
+    for _ in range(requests):
+        query = rng.choice(queries)
+        start = time.perf_counter()
+        await facade.search(query, operator=rng.choice(["ET", "OU"]), top_k=10)
+        latencies.append(time.perf_counter() - start)
+
+async def writer(facade, rng, vocabulary, weights, stop):
+    # Indexation continue pendant la charge : vérifie que lectures et écritures cohabitent
+    count = 0
+    while not stop.is_set():
+        await facade.index_document(f"live{count}", generate_document(rng, vocabulary, weights))
+        count += 1
+    return count
+
+async def run(args):
+    rng = random.Random(0)
+    vocabulary = [f"mot{i}" for i in range(args.vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    engine = SearchEngine(cache_size=args.cache_size)
+    for doc in range(args.documents):
+        engine.index_document(f"doc{doc}", generate_document(rng, vocabulary, weights))
+    queries = [" ".join(rng.choices(vocabulary[:2000], k=rng.randint(1, 3))) for _ in range(args.distinct_queries)]
+
+    facade = AsyncSearchEngine(engine, max_workers=args.threads)
+    latencies = []
+    stop = asyncio.Event()
+    writer_task = asyncio.create_task(writer(facade, random.Random(1), vocabulary, weights, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(client(facade, queries, args.requests, latencies, random.Random(seed))
+                           for seed in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    indexed = await writer_task
+    facade.close()
+
+    print(f"Clients : {args.clients}  Requêtes : {len(latencies)}  Documents indexés pendant la charge : {indexed}")
+    print(f"Débit : {len(latencies) / elapsed:.1f} requêtes/s")
+    print(f"Latence (ms) : moyenne {statistics.mean(latencies) * 1000:.2f}  p50 {percentile(latencies, 0.5) * 1000:.2f}  "
+          f"p95 {percentile(latencies, 0.95) * 1000:.2f}  p99 {percentile(latencies, 0.99) * 1000:.2f}")
+    print(f"Caches : {engine.cache_stats()}")
+
+    # Même charge en un seul lot : termes et blocs décodés partagés
+    batch = [rng.choice(queries) for _ in range(len(latencies))]
+    start = time.perf_counter()
+    engine.search_many(batch, top_k=10)
+    print(f"search_many : {len(batch) / (time.perf_counter() - start):.1f} requêtes/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge concurrente sur SearchEngine")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20, help="Requêtes par client")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--distinct-queries", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8, help="Threads du pool de la façade asyncio")
+    parser.add_argument("--cache-size", type=int, default=1024, help="0 : mesurer sans cache")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
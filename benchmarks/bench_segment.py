@@ -0,0 +1,66 @@
+# Segments d'index : temps d'écriture et d'ouverture, et vérification de l'aller-retour save/open
+# (mêmes résultats qu'en mémoire, y compris pour 1 à 5 documents : alignement des postings du premier terme)
+# Utilisation : python benchmarks/bench_segment.py --documents 1000 10000
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import SearchEngine
+
+def build_engine(documents, rng, vocabulary, positional=False):
+    engine = SearchEngine(positional=positional, cache_size=0)
+    for doc in range(documents):
+        engine.index_document(f"doc{doc}", " ".join(rng.choices(vocabulary, k=rng.randint(1, 50))))
+    return engine
+
+def check_round_trip(engine, path, queries):
+    engine.save(path)
+    reopened = SearchEngine.open(path)
+    for query in queries:
+        for operator in ("ET", "OU"):
+            for top_k in (None, 3):
+                expected = engine.search(query, operator=operator, top_k=top_k)
+                found = reopened.search(query, operator=operator, top_k=top_k)
+                assert found == expected, (query, operator, top_k, found, expected)
+    return reopened
+
+def main():
+    parser = argparse.ArgumentParser(description="Segments d'index : écriture, ouverture et aller-retour")
+    parser.add_argument("--documents", type=int, nargs="+", default=[1000, 10000], help="Nombres de documents")
+    parser.add_argument("--vocabulary", type=int, default=2000, help="Taille du vocabulaire")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"mot{i}" for i in range(args.vocabulary)]
+    queries = [" ".join(rng.choices(vocabulary[:50], k=rng.randint(1, 3))) for _ in range(20)]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "index.seg")
+        # Petits index : toutes les tailles de la table des documents supprimés modulo 4, avec et sans positions
+        for documents in range(1, 6):
+            for positional in (False, True):
+                small = build_engine(documents, rng, vocabulary[:10], positional)
+                check_round_trip(small, path, ["mot0", "mot1 mot2", "mot3 mot4 mot5"])
+                if documents > 1:
+                    small.delete_document("doc0")
+                    check_round_trip(small, path, ["mot0", "mot1 mot2"])
+        print("Aller-retour save/open vérifié pour 1 à 5 documents.")
+
+        print(f"{'Documents':>10} {'Écriture (s)':>14} {'Ouverture (ms)':>16} {'Taille (Mo)':>12}")
+        for documents in args.documents:
+            engine = build_engine(documents, rng, vocabulary)
+            start = time.perf_counter()
+            engine.save(path)
+            write_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            SearchEngine.open(path)
+            open_ms = (time.perf_counter() - start) * 1000
+            check_round_trip(engine, path, queries)
+            print(f"{documents:>10} {write_seconds:>14.3f} {open_ms:>16.2f} {os.path.getsize(path) / 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Requêtes point à point : Dijkstra complet vs arrêt anticipé, bidirectionnel et A* (euclidien, ALT)
+# Utilisation : python benchmarks/bench_shortest_path.py --sides 100 300 --queries 20
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dij_app import (CSRGraph, astar, bidirectional_dijkstra, dijkstra_csr, euclidean_heuristic,
+                     landmark_heuristic, select_landmarks)
+
+def generate_grid_graph(side, seed=0):
+    # Grille non orientée side x side, poids >= longueur des arêtes (proche d'un réseau routier)
+    rng = np.random.default_rng(seed)
+    ids = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    targets = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    weights = rng.uniform(1, 2, len(sources))
+    graph = CSRGraph.from_edges(np.concatenate([sources, targets]), np.concatenate([targets, sources]),
+                                np.concatenate([weights, weights]), side * side)
+    x, y = (ids % side).ravel().astype(float), (ids // side).ravel().astype(float)
+    return graph, x, y
+
+def average_ms(function, pairs):
+    start = time.perf_counter()
+    for source, target in pairs:
+        function(source, target)
+    return (time.perf_counter() - start) / len(pairs) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Plus court chemin point à point")
+    parser.add_argument("--sides", type=int, nargs="+", default=[100, 300], help="Côtés des grilles")
+    parser.add_argument("--queries", type=int, default=20, help="Nombre de requêtes par taille")
+    parser.add_argument("--landmarks", type=int, default=8, help="Nombre de repères ALT")
+    args = parser.parse_args()
+
+    print(f"{'Nœuds':>10} {'Complet':>9} {'Arrêt':>9} {'Bidir.':>9} {'A* eucl.':>9} {'A* ALT':>9}  (ms)")
+    for side in args.sides:
+        graph, x, y = generate_grid_graph(side)
+        graph.reverse()
+        _, table = select_landmarks(graph, args.landmarks)
+        rng = np.random.default_rng(1)
+        pairs = [tuple(int(node) for node in rng.integers(graph.num_nodes, size=2)) for _ in range(args.queries)]
+        timings = [
+            average_ms(lambda s, t: dijkstra_csr(graph, s), pairs),
+            average_ms(lambda s, t: dijkstra_csr(graph, s, t), pairs),
+            average_ms(lambda s, t: bidirectional_dijkstra(graph, s, t), pairs),
+            average_ms(lambda s, t: astar(graph, s, t, euclidean_heuristic(x, y, t)), pairs),
+            average_ms(lambda s, t: astar(graph, s, t, landmark_heuristic(table, t)), pairs),
+        ]
+        print(f"{graph.num_nodes:>10} " + " ".join(f"{timing:>9.1f}" for timing in timings))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# Banc d'essai reproductible des trois moteurs (recherche, Huffman, Dijkstra) sur des données synthétiques
+# à plusieurs échelles : débit, percentiles de latence et pic mémoire (tracemalloc), écrits en JSON
+# pour comparer les résultats d'un commit à l'autre.
+# Utilisation :
+#   python benchmarks/run_benchmarks.py --scale small --output results.json
+#   python benchmarks/run_benchmarks.py --scale medium --only search huffman --compare results.json
+# Échelles (documents / texte / arêtes) : small 1k / 1 Mo / 100k, medium 10k / 16 Mo / 1M,
+# large 100k / 128 Mo / 4M, huge 1M / 1 Go / 10M.
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dij_app import dijkstra_csr, generate_sparse_graph, shortest_path
+from huffman import build_codes, calculate_frequency, compress_bytes, compress_stream, decompress_bytes, decompress_stream
+from search_engine import SearchEngine
+
+SCALES = {
+    "small": {"documents": 1_000, "text_bytes": 1 << 20, "edges": 100_000},
+    "medium": {"documents": 10_000, "text_bytes": 16 << 20, "edges": 1_000_000},
+    "large": {"documents": 100_000, "text_bytes": 128 << 20, "edges": 4_000_000},
+    "huge": {"documents": 1_000_000, "text_bytes": 1 << 30, "edges": 10_000_000},
+}
+VOCABULARY_SIZE = 50_000
+WORDS_PER_DOCUMENT = 100
+QUERIES = 200
+GRAPH_QUERIES = 50
+GRAPH_DEGREE = 4
+IN_MEMORY_TEXT_LIMIT = 64 << 20  # Au-delà, seule la compression en flux est mesurée
+STREAM_CHUNK_CHARS = 1 << 20
+
+# --- Générateurs de données (graine fixe : mêmes données d'une exécution à l'autre) ---
+
+def generate_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))))
+    return sorted(words)
+
+def zipf_indices(rng, count, size, exponent=1.1):
+    # Rangs tirés selon une loi de Zipf bornée : quelques mots très fréquents, une longue traîne
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return rng.choice(size, size=count, p=weights / weights.sum())
+
+def generate_corpus(documents, seed=0):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(generate_vocabulary(VOCABULARY_SIZE, seed))
+    for doc_id in range(documents):
+        yield doc_id, " ".join(vocabulary[zipf_indices(rng, WORDS_PER_DOCUMENT, len(vocabulary))])
+
+def generate_queries(count, seed=1):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(generate_vocabulary(VOCABULARY_SIZE, 0))
+    return [" ".join(vocabulary[zipf_indices(rng, int(rng.integers(1, 4)), 2000)]) for _ in range(count)]
+
+def generate_text_chunks(total_chars, seed=0):
+    # Texte à la distribution de caractères d'une langue naturelle (lettres, espaces, ponctuation, quelques accents)
+    alphabet = list(" etaoinsrhldcumfpgwybvkxjqz") + list(".,;:!?'\n") + list("éèàùçê") + list(string.ascii_uppercase)
+    rng = np.random.default_rng(seed)
+    probabilities = 1.0 / np.arange(1, len(alphabet) + 1) ** 1.2
+    probabilities /= probabilities.sum()
+    symbols = np.array(alphabet)
+    remaining = total_chars
+    while remaining > 0:
+        size = min(STREAM_CHUNK_CHARS, remaining)
+        yield "".join(symbols[rng.choice(len(alphabet), size=size, p=probabilities)])
+        remaining -= size
+
+# --- Mesures ---
+
+def latency_summary(samples):
+    samples = np.asarray(samples) * 1000
+    return {"mean": float(samples.mean()), "p50": float(np.percentile(samples, 50)),
+            "p95": float(np.percentile(samples, 95)), "p99": float(np.percentile(samples, 99)),
+            "max": float(samples.max())}
+
+def peak_memory(function):
+    # Pic mémoire d'une exécution séparée : tracemalloc ralentit trop pour fausser les temps mesurés à côté
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+def result(name, scale, parameters, seconds, operations, unit, latencies=None, memory_mb=None):
+    return {"name": name, "scale": scale, "parameters": parameters, "seconds": seconds,
+            "throughput": operations / seconds if seconds else None, "unit": unit,
+            "latency_ms": latency_summary(latencies) if latencies else None, "peak_memory_mb": memory_mb}
+
+# --- Bancs d'essai ---
+
+def bench_search(scale, sizes, measure_memory):
+    documents = sizes["documents"]
+    corpus = list(generate_corpus(documents))
+    engine = SearchEngine(cache_size=0)  # Sans cache : chaque requête est réellement exécutée
+    latencies = []
+    start = time.perf_counter()
+    for doc_id, content in corpus:
+        began = time.perf_counter()
+        engine.index_document(doc_id, content)
+        latencies.append(time.perf_counter() - began)
+    seconds = time.perf_counter() - start
+    memory = None
+    if measure_memory:
+        def index_all():
+            memory_engine = SearchEngine(cache_size=0)
+            for doc_id, content in corpus:
+                memory_engine.index_document(doc_id, content)
+        memory = peak_memory(index_all)
+    yield result("search.index_document", scale, {"documents": documents, "words_per_document": WORDS_PER_DOCUMENT},
+                 seconds, documents, "documents/s", latencies, memory)
+
+    queries = generate_queries(QUERIES)
+    for operator in ("ET", "OU"):
+        latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            began = time.perf_counter()
+            engine.search(query, operator=operator, top_k=10)
+            latencies.append(time.perf_counter() - began)
+        seconds = time.perf_counter() - start
+        memory = peak_memory(lambda: [engine.search(query, operator=operator, top_k=10) for query in queries]) if measure_memory else None
+        yield result(f"search.search.{operator}", scale, {"documents": documents, "queries": QUERIES, "top_k": 10},
+                     seconds, QUERIES, "queries/s", latencies, memory)
+
+def bench_huffman(scale, sizes, measure_memory):
+    total_chars = sizes["text_bytes"]
+    with tempfile.TemporaryDirectory() as folder:
+        source_path = os.path.join(folder, "source.txt")
+        compressed_path = os.path.join(folder, "source.huf")
+        restored_path = os.path.join(folder, "restored.txt")
+        with open(source_path, "w", encoding="utf-8", newline="") as handle:
+            for chunk in generate_text_chunks(total_chars):
+                handle.write(chunk)
+        size = os.path.getsize(source_path)
+
+        def compress_file():
+            with open(source_path, "r", encoding="utf-8", newline="") as source, open(compressed_path, "wb") as destination:
+                compress_stream(source, destination)
+
+        def decompress_file():
+            with open(compressed_path, "rb") as source, open(restored_path, "w", encoding="utf-8", newline="") as destination:
+                decompress_stream(source, destination)
+
+        for name, function in (("huffman.compress_stream", compress_file), ("huffman.decompress_stream", decompress_file)):
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+            memory = peak_memory(function) if measure_memory else None
+            yield result(name, scale, {"bytes": size, "compressed_bytes": os.path.getsize(compressed_path)},
+                         seconds, size / 1e6, "MB/s", None, memory)
+
+        if total_chars <= IN_MEMORY_TEXT_LIMIT:
+            with open(source_path, "r", encoding="utf-8", newline="") as handle:
+                text = handle.read()
+            # Compression complète en mémoire : comptage, construction des codes puis encodage
+            compress_text = lambda: compress_bytes(text, build_codes(calculate_frequency(text)))
+            data = compress_text()
+            for name, function in (("huffman.compress_bytes", compress_text),
+                                   ("huffman.decompress_bytes", lambda: decompress_bytes(data))):
+                start = time.perf_counter()
+                function()
+                seconds = time.perf_counter() - start
+                memory = peak_memory(function) if measure_memory else None
+                yield result(name, scale, {"bytes": size}, seconds, size / 1e6, "MB/s", None, memory)
+
+def bench_dijkstra(scale, sizes, measure_memory):
+    num_nodes = 2 * sizes["edges"] // GRAPH_DEGREE  # Graphe non orienté : arêtes = nœuds x degré / 2
+    start = time.perf_counter()
+    graph = generate_sparse_graph(num_nodes, GRAPH_DEGREE, seed=0)
+    seconds = time.perf_counter() - start
+    memory = peak_memory(lambda: generate_sparse_graph(num_nodes, GRAPH_DEGREE, seed=0)) if measure_memory else None
+    parameters = {"nodes": graph.num_nodes, "edges": graph.num_edges // 2, "degree": GRAPH_DEGREE}
+    yield result("dijkstra.generate_sparse_graph", scale, parameters, seconds, graph.num_edges // 2, "edges/s", None, memory)
+
+    rng = np.random.default_rng(1)
+    pairs = [tuple(int(node) for node in rng.integers(graph.num_nodes, size=2)) for _ in range(GRAPH_QUERIES)]
+    graph.reverse()  # Graphe transposé construit hors mesure (une fois par graphe)
+    benchmarks = (
+        ("dijkstra.dijkstra_csr", lambda source, target: dijkstra_csr(graph, source), max(1, GRAPH_QUERIES // 10)),
+        ("dijkstra.dijkstra_csr.early_exit", lambda source, target: dijkstra_csr(graph, source, target), GRAPH_QUERIES),
+        ("dijkstra.shortest_path.bidirectional", lambda source, target: shortest_path(graph, source, target), GRAPH_QUERIES),
+    )
+    for name, function, count in benchmarks:
+        latencies = []
+        start = time.perf_counter()
+        for source, target in pairs[:count]:
+            began = time.perf_counter()
+            function(source, target)
+            latencies.append(time.perf_counter() - began)
+        seconds = time.perf_counter() - start
+        memory = peak_memory(lambda: function(*pairs[0])) if measure_memory else None
+        yield result(name, scale, dict(parameters, queries=count), seconds, count, "queries/s", latencies, memory)
+
+BENCHMARKS = {"search": bench_search, "huffman": bench_huffman, "dijkstra": bench_dijkstra}
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def compare(results, previous_path):
+    # Rapport débit actuel / débit précédent pour chaque mesure présente dans les deux fichiers
+    with open(previous_path, "r", encoding="utf-8") as handle:
+        previous = {(entry["name"], entry["scale"]): entry for entry in json.load(handle)["results"]}
+    print(f"\n{'Mesure':<42} {'Avant':>12} {'Après':>12} {'Rapport':>8}")
+    for entry in results:
+        before = previous.get((entry["name"], entry["scale"]))
+        if before and before["throughput"] and entry["throughput"]:
+            ratio = entry["throughput"] / before["throughput"]
+            flag = "  <- régression" if ratio < 0.9 else ""
+            print(f"{entry['name']:<42} {before['throughput']:>12.1f} {entry['throughput']:>12.1f} {ratio:>7.2f}x{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai des moteurs ALGOFUSION")
+    parser.add_argument("--scale", choices=SCALES, nargs="+", default=["small"], help="Échelles à mesurer")
+    parser.add_argument("--only", choices=BENCHMARKS, nargs="+", default=list(BENCHMARKS), help="Moteurs à mesurer")
+    parser.add_argument("--no-memory", action="store_true", help="Ne pas mesurer le pic mémoire (plus rapide)")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--compare", help="Fichier JSON d'une exécution précédente à comparer")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'Mesure':<42} {'Échelle':<8} {'Débit':>14} {'p50 (ms)':>10} {'p99 (ms)':>10} {'Mémoire (Mo)':>13}")
+    for scale in args.scale:
+        for name in args.only:
+            for entry in BENCHMARKS[name](scale, SCALES[scale], not args.no_memory):
+                results.append(entry)
+                latency = entry["latency_ms"] or {}
+                print(f"{entry['name']:<42} {scale:<8} {entry['throughput']:>9.1f} {entry['unit']:<4} "
+                      f"{latency.get('p50', float('nan')):>10.3f} {latency.get('p99', float('nan')):>10.3f} "
+                      f"{entry['peak_memory_mb'] if entry['peak_memory_mb'] is not None else float('nan'):>13.1f}", flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"environment": environment(), "results": results}, handle, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()  # Valeur renvoyée par get() quand la clé est absente ou expirée
+
+class LRUCache:
+    # Cache de taille bornée : l'entrée la moins récemment utilisée est évincée en premier
+    # ttl (secondes) : durée de vie optionnelle de chaque entrée
+    # generation : version de la source des données ; une entrée d'une autre génération est périmée
+    # max_bytes : budget mémoire optionnel ; chaque put() indique alors la taille (octets) de sa valeur
+    def __init__(self, max_size, ttl=None, max_bytes=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # Clé -> (date d'expiration, génération, valeur, taille)
+        self.nbytes = 0  # Somme des tailles des entrées présentes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, generation=None):
+        with self.lock:
+            entry = self.entries.get(key, MISSING)
+            if entry is not MISSING and (entry[1] != generation or (entry[0] is not None and entry[0] < time.monotonic())):
+                self._remove(key)  # Entrée expirée ou périmée
+                entry = MISSING
+            if entry is MISSING:
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, generation=None, size=0):
+        if self.max_size <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return  # Valeur plus grosse que tout le budget : jamais mise en cache
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (expires, generation, value, size)
+            self.nbytes += size
+            while len(self.entries) > self.max_size or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        self.nbytes -= self.entries.pop(key)[3]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "max_size": self.max_size,
+                "bytes": self.nbytes, "max_bytes": self.max_bytes}
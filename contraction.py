@@ -0,0 +1,271 @@
+import hashlib
+import heapq
+import math
+import os
+import numpy as np
+from dij_app import CSRGraph, graph_fingerprint
+
+# Hiérarchie de contraction (contraction hierarchies) : prétraitement d'un graphe fixe pour des requêtes
+# de plus court chemin en quelques millisecondes.
+# Les nœuds sont contractés un par un, du moins important au plus important ; quand un nœud v disparaît,
+# un raccourci u -> w (poids w(u, v) + w(v, w)) remplace chaque chemin u -> v -> w qui n'a pas d'alternative
+# aussi courte (recherche de témoin). Une requête est alors un Dijkstra bidirectionnel qui ne monte que vers
+# des nœuds de rang supérieur : l'espace exploré reste très petit.
+# Chaque arête de la hiérarchie garde son nœud « milieu » (-1 pour une arête d'origine) pour dérouler le chemin.
+
+WITNESS_SETTLE_LIMIT = 64  # Nœuds fixés au plus par recherche de témoin (limite = quelques raccourcis inutiles en plus)
+
+def _witness_distances(out_adjacency, source, excluded, targets, max_distance):
+    # Dijkstra local depuis source sans passer par excluded, arrêté à max_distance
+    # ou dès que toutes les cibles sont fixées
+    dist = {source: 0}
+    priority_queue = [(0, source)]
+    remaining = len(targets)
+    settled = 0
+    while priority_queue and settled < WITNESS_SETTLE_LIMIT:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if current_distance > dist[current_node]:
+            continue
+        if current_distance > max_distance:
+            break
+        if current_node in targets:
+            remaining -= 1
+            if not remaining:
+                break
+        settled += 1
+        for neighbor, weight in out_adjacency[current_node].items():
+            if neighbor == excluded:
+                continue
+            distance = current_distance + weight
+            if distance < dist.get(neighbor, math.inf):
+                dist[neighbor] = distance
+                heapq.heappush(priority_queue, (distance, neighbor))
+    return dist
+
+def _shortcuts(out_adjacency, in_adjacency, node):
+    # Raccourcis nécessaires si node est contracté : liste de (u, w, poids)
+    shortcuts = []
+    if not out_adjacency[node]:
+        return shortcuts
+    max_out = max(out_adjacency[node].values())
+    for u, weight_in in in_adjacency[node].items():
+        witness = _witness_distances(out_adjacency, u, node, out_adjacency[node], weight_in + max_out)
+        for w, weight_out in out_adjacency[node].items():
+            if w != u and witness.get(w, math.inf) > weight_in + weight_out:
+                shortcuts.append((u, w, weight_in + weight_out))
+    return shortcuts
+
+def hierarchy_fingerprint(graph):
+    # Empreinte du graphe d'origine (arêtes, poids et noms des nœuds) : une hiérarchie enregistrée
+    # n'est réutilisée que pour le graphe qui l'a produite
+    digest = hashlib.blake2b(graph_fingerprint(graph).encode(), digest_size=16)
+    for name in graph.names if graph.names is not None else ():
+        digest.update(str(name).encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+def _to_csr(rows):
+    # Lignes {voisin: (poids, milieu)} -> tableaux CSR avec le milieu de chaque arête
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    indices = np.fromiter((neighbor for row in rows for neighbor in row), dtype=np.int32, count=indptr[-1])
+    weights = np.fromiter((row[neighbor][0] for row in rows for neighbor in row), dtype=np.float64, count=indptr[-1])
+    middles = np.fromiter((row[neighbor][1] for row in rows for neighbor in row), dtype=np.int32, count=indptr[-1])
+    return indptr, indices, weights, middles
+
+class ContractionHierarchy:
+    # forward : arêtes montantes v -> w (rang de w > rang de v)
+    # backward : arêtes montantes inversées, la ligne v contient les u tels que u -> v avec rang de u > rang de v
+    def __init__(self, rank, forward, backward, names=None, fingerprint=None):
+        self.rank = rank
+        self.forward = forward  # (indptr, indices, weights, middles)
+        self.backward = backward
+        self.names = names
+        self.fingerprint = fingerprint  # hierarchy_fingerprint du graphe d'origine (None : inconnue)
+        self._ids = None
+        self._views = [tuple(memoryview(array) for array in side) for side in (forward, backward)]
+
+    @property
+    def num_nodes(self):
+        return len(self.rank)
+
+    @property
+    def nbytes(self):
+        return self.rank.nbytes + sum(array.nbytes for side in (self.forward, self.backward) for array in side)
+
+    @classmethod
+    def build(cls, graph, progress=None):
+        # progress(nœuds contractés, total) est appelé régulièrement pendant le prétraitement
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_dict(graph)
+        num_nodes = graph.num_nodes
+        out_adjacency = [{} for _ in range(num_nodes)]
+        in_adjacency = [{} for _ in range(num_nodes)]
+        middle = {}  # (u, w) -> nœud contracté qu'un raccourci enjambe
+        for source, target, weight in zip(graph.edge_sources().tolist(), graph.indices.tolist(), graph.weights.tolist()):
+            if source != target and weight < out_adjacency[source].get(target, math.inf):
+                out_adjacency[source][target] = weight
+                in_adjacency[target][source] = weight
+
+        # Priorité : raccourcis ajoutés - arêtes supprimées + voisins déjà contractés (répartit la contraction)
+        contracted_neighbors = [0] * num_nodes
+        def priority(node, shortcuts):
+            degree = len(out_adjacency[node]) + len(in_adjacency[node])
+            return len(shortcuts) - degree + contracted_neighbors[node]
+        priority_queue = [(priority(node, _shortcuts(out_adjacency, in_adjacency, node)), node) for node in range(num_nodes)]
+        heapq.heapify(priority_queue)
+
+        rank = np.zeros(num_nodes, dtype=np.int32)
+        forward_rows, backward_rows = [None] * num_nodes, [None] * num_nodes
+        level = 0
+        while priority_queue:
+            _, node = heapq.heappop(priority_queue)
+            # Mise à jour paresseuse : la priorité a pu augmenter depuis l'insertion
+            shortcuts = _shortcuts(out_adjacency, in_adjacency, node)
+            current = priority(node, shortcuts)
+            if priority_queue and current > priority_queue[0][0]:
+                heapq.heappush(priority_queue, (current, node))
+                continue
+            rank[node] = level
+            level += 1
+            forward_rows[node] = {w: (weight, middle.get((node, w), -1)) for w, weight in out_adjacency[node].items()}
+            backward_rows[node] = {u: (weight, middle.get((u, node), -1)) for u, weight in in_adjacency[node].items()}
+            for w in out_adjacency[node]:
+                del in_adjacency[w][node]
+                contracted_neighbors[w] += 1
+            for u in in_adjacency[node]:
+                del out_adjacency[u][node]
+                contracted_neighbors[u] += 1
+            out_adjacency[node], in_adjacency[node] = {}, {}
+            for u, w, weight in shortcuts:
+                if weight < out_adjacency[u].get(w, math.inf):
+                    out_adjacency[u][w] = weight
+                    in_adjacency[w][u] = weight
+                    middle[(u, w)] = node
+            if progress and level % 1000 == 0:
+                progress(level, num_nodes)
+        if progress:
+            progress(num_nodes, num_nodes)
+        return cls(rank, _to_csr(forward_rows), _to_csr(backward_rows), graph.names, hierarchy_fingerprint(graph))
+
+    def save(self, path):
+        # Fichier .npz écrit à côté puis renommé, comme les segments d'index
+        arrays = {"rank": self.rank}
+        for side_name, side in (("forward", self.forward), ("backward", self.backward)):
+            for array_name, array in zip(("indptr", "indices", "weights", "middles"), side):
+                arrays[f"{side_name}_{array_name}"] = array
+        if self.names is not None:
+            arrays["names"] = np.array([str(name) for name in self.names])
+        if self.fingerprint is not None:
+            arrays["fingerprint"] = np.array(self.fingerprint)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            sides = [tuple(arrays[f"{side_name}_{array_name}"] for array_name in ("indptr", "indices", "weights", "middles"))
+                     for side_name in ("forward", "backward")]
+            names = arrays["names"].tolist() if "names" in arrays else None
+            fingerprint = str(arrays["fingerprint"]) if "fingerprint" in arrays else None
+            return cls(arrays["rank"], sides[0], sides[1], names, fingerprint)
+
+    def matches(self, graph):
+        # Vrai si la hiérarchie a été construite sur ce graphe (mêmes arêtes, poids et noms)
+        return self.fingerprint is not None and self.fingerprint == hierarchy_fingerprint(graph)
+
+    def _upward_step(self, side, dist, parents, priority_queue, other_dist, best):
+        indptr, indices, weights, _ = self._views[side]
+        down_indptr, down_indices, down_weights, _ = self._views[1 - side]
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if current_distance > dist[current_node]:
+            return best
+        if current_node in other_dist and current_distance + other_dist[current_node] < best[0]:
+            best = (current_distance + other_dist[current_node], current_node)
+        # Stall-on-demand : un nœud de rang supérieur déjà atteint offre un trajet plus court vers ce nœud,
+        # inutile de le développer (sa distance montante n'est pas la bonne)
+        for edge in range(down_indptr[current_node], down_indptr[current_node + 1]):
+            if dist.get(down_indices[edge], math.inf) + down_weights[edge] < current_distance:
+                return best
+        for edge in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[edge]
+            distance = current_distance + weights[edge]
+            if distance < dist.get(neighbor, math.inf):
+                dist[neighbor] = distance
+                parents[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance, neighbor))
+        return best
+
+    def query(self, source, target):
+        # Retourne (distance, chemin en identifiants) ; (inf, []) si la cible est inaccessible
+        forward_dist, backward_dist = {source: 0.0}, {target: 0.0}
+        forward_parents, backward_parents = {source: -1}, {target: -1}
+        forward_queue, backward_queue = [(0.0, source)], [(0.0, target)]
+        best = (math.inf, -1)
+        # Chaque côté continue tant que son minimum peut encore améliorer le meilleur point de rencontre
+        while True:
+            forward_open = forward_queue and forward_queue[0][0] < best[0]
+            backward_open = backward_queue and backward_queue[0][0] < best[0]
+            if not forward_open and not backward_open:
+                break
+            if forward_open:
+                best = self._upward_step(0, forward_dist, forward_parents, forward_queue, backward_dist, best)
+            if backward_open:
+                best = self._upward_step(1, backward_dist, backward_parents, backward_queue, forward_dist, best)
+        distance, meeting = best
+        if meeting == -1:
+            return math.inf, []
+        path = [meeting]
+        node = meeting
+        while forward_parents[node] != -1:
+            self._unpack(forward_parents[node], node, path, prepend=True)
+            node = forward_parents[node]
+        node = meeting
+        while backward_parents[node] != -1:
+            self._unpack(node, backward_parents[node], path)
+            node = backward_parents[node]
+        return distance, path
+
+    def _middle(self, u, w):
+        # Milieu de l'arête u -> w de la hiérarchie, rangée chez son extrémité de rang inférieur
+        if self.rank[u] < self.rank[w]:
+            indptr, indices, _, middles = self._views[0]
+            row, other = u, w
+        else:
+            indptr, indices, _, middles = self._views[1]
+            row, other = w, u
+        for edge in range(indptr[row], indptr[row + 1]):
+            if indices[edge] == other:
+                return middles[edge]
+        raise KeyError((u, w))
+
+    def _unpack(self, u, w, path, prepend=False):
+        # Dérouler l'arête u -> w en arêtes d'origine (pile explicite, sans récursion)
+        # et ajouter ses nœuds au chemin, hors u (ajout en fin) ou hors w (ajout en tête)
+        nodes = []
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            m = self._middle(a, b)
+            if m == -1:
+                nodes.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+        if prepend:
+            path[:0] = [u] + nodes[:-1]
+        else:
+            path.extend(nodes)
+
+    def node_id(self, name):
+        if self.names is None:
+            return name
+        if self._ids is None:
+            self._ids = {node_name: node_id for node_id, node_name in enumerate(self.names)}
+        return self._ids[name]
+
+    def shortest_path(self, start, end):
+        # Même interface que dij_app.shortest_path : (distance, chemin en noms)
+        distance, path = self.query(self.node_id(start), self.node_id(end))
+        return distance, path if self.names is None else [self.names[node] for node in path]
@@ -1,12 +1,416 @@
 # Importation des bibliothèques nécessaires
-import streamlit as st  # Pour créer une interface utilisateur interactive
+# streamlit, networkx et matplotlib ne servent qu'à l'affichage : ils sont importés dans draw_graph et app,
+# pour que les calculs (ligne de commande, traitements par lot) démarrent sans eux
 import heapq  # Pour manipuler une file de priorité utilisée dans l'algorithme de Dijkstra
-import networkx as nx  # Pour manipuler et visualiser des graphes
-import matplotlib.pyplot as plt  # Pour afficher les graphes créés avec NetworkX
+import math  # Pour les heuristiques géométriques de A*
+import hashlib  # Pour identifier un graphe par son contenu (cache des dispositions)
+import os  # Pour connaître le nombre de cœurs disponibles
 import random  # Pour générer des valeurs aléatoires
+import numpy as np  # Pour stocker les graphes de grande taille dans des tableaux compacts
+from concurrent.futures import ProcessPoolExecutor  # Pour répartir les sources d'un calcul par lot sur plusieurs cœurs
+from multiprocessing import shared_memory  # Pour partager le graphe en lecture seule entre les processus
+from cache import MISSING, LRUCache  # Pour réutiliser les dispositions calculées d'un affichage à l'autre
+from instrumentation import count, phase  # Pour mesurer les recherches (métriques optionnelles)
+
+# Graphe compact au format CSR (Compressed Sparse Row) :
+# les voisins du nœud i sont indices[indptr[i]:indptr[i + 1]], avec les poids correspondants dans weights.
+# Les nœuds sont des entiers ; names fait la correspondance identifiant <-> nom.
+class CSRGraph:
+    def __init__(self, indptr, indices, weights, names=None):
+        self.indptr = indptr  # int64, taille nombre de nœuds + 1
+        self.indices = indices  # int32, voisins de chaque nœud mis bout à bout
+        self.weights = weights  # float64, poids des arêtes
+        self.names = names  # Liste des noms (None : les identifiants servent de noms)
+        self.coordinates = None  # Positions (nœuds x 2) des graphes géométriques, utilisées pour l'affichage
+        self._ids = None
+        self._reverse = None
+        self._fingerprint = None  # Empreinte du contenu (graph_fingerprint), calculée au premier besoin
+        self._integer_weights = False  # Graphe d'origine à poids entiers : distances rendues en int par dijkstra
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights, num_nodes, names=None):
+        # Construction vectorisée à partir de listes d'arêtes orientées (les poids nuls = pas de connexion)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        keep = weights != 0
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        index_type = np.int32 if num_nodes < 2**31 else np.int64
+        return cls(indptr, targets[order].astype(index_type), weights[order], names)
+
+    @classmethod
+    def from_dict(cls, graph):
+        # Conversion unique du format historique {nœud: {voisin: poids}}
+        names = list(graph)
+        ids = {name: node_id for node_id, name in enumerate(names)}
+        sources, targets, weights = [], [], []
+        for node, neighbors in graph.items():
+            for neighbor, weight in neighbors.items():
+                if neighbor not in ids:  # Voisin sans entrée propre dans le dictionnaire
+                    ids[neighbor] = len(names)
+                    names.append(neighbor)
+                sources.append(ids[node])
+                targets.append(ids[neighbor])
+                weights.append(weight)
+        csr = cls.from_edges(sources, targets, weights, len(names), names)
+        csr._ids = ids
+        csr._integer_weights = all(isinstance(weight, (int, np.integer)) for weight in weights)
+        return csr
+
+    def edge_sources(self):
+        # Nœud de départ de chaque arête, dans l'ordre de indices
+        return np.repeat(np.arange(self.num_nodes, dtype=self.indices.dtype), np.diff(self.indptr))
+
+    def reverse(self):
+        # Graphe transposé (arêtes inversées), calculé une fois : sert à la recherche arrière
+        if self._reverse is None:
+            self._reverse = CSRGraph.from_edges(self.indices, self.edge_sources(), self.weights, self.num_nodes, self.names)
+            self._reverse._ids = self._ids
+            self._reverse._reverse = self
+        return self._reverse
+
+    def node_id(self, name):
+        if self.names is None:
+            return name
+        if self._ids is None:
+            self._ids = {node_name: node_id for node_id, node_name in enumerate(self.names)}
+        return self._ids[name]
+
+    def node_name(self, node_id):
+        return node_id if self.names is None else self.names[node_id]
+
+    def path(self, predecessors, target):
+        # Reconstruire le chemin (noms) en remontant les prédécesseurs depuis la cible
+        return [self.node_name(node) for node in _path_ids(predecessors, target)]
+
+def _path_ids(predecessors, target):
+    path = []
+    node = target
+    while node != -1:
+        path.append(node)
+        node = int(predecessors[node])
+    path.reverse()
+    return path
+
+# Dijkstra sur un graphe CSR : distances et prédécesseurs dans des tableaux NumPy
+# Avec target, la recherche s'arrête dès que la cible est fixée (les autres distances restent provisoires)
+# Le tas n'a pas de decrease-key : une amélioration ajoute une entrée, les entrées périmées sont ignorées
+# Compteurs d'une recherche : seuls les retraits du tas et les nœuds fixés sont comptés dans la boucle,
+# les insertions s'en déduisent (retraits + entrées restantes) et les relâchements réussis aussi (insertions - départs)
+def _count_search(metrics, pops, settled, remaining, initial=1):
+    if metrics is None:
+        return
+    pushes = pops + remaining
+    count(metrics, "dijkstra.heap_pops", pops)
+    count(metrics, "dijkstra.heap_pushes", pushes)
+    count(metrics, "dijkstra.relaxations", pushes - initial)
+    count(metrics, "dijkstra.settled", settled)
+
+# metrics (instrumentation.Metrics, optionnel) : durée de la recherche et compteurs du tas
+def dijkstra_csr(graph, source, target=None, metrics=None):
+    with phase(metrics, "dijkstra.search"):
+        return _dijkstra_csr(graph, source, target, metrics)
+
+def _dijkstra_csr(graph, source, target, metrics):
+    dist = np.full(graph.num_nodes, np.inf)
+    predecessors = np.full(graph.num_nodes, -1, dtype=np.int64)
+    # Les memoryview donnent un accès élément par élément bien plus rapide que l'indexation NumPy
+    indptr, indices, weights = memoryview(graph.indptr), memoryview(graph.indices), memoryview(graph.weights)
+    distances, previous = memoryview(dist), memoryview(predecessors)
+    distances[source] = 0
+    priority_queue = [(0, source)]
+    pops = settled = 0
+    while priority_queue:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        pops += 1
+        if current_distance > distances[current_node]:  # Entrée périmée
+            continue
+        settled += 1
+        if current_node == target:  # Cible fixée : sa distance est définitive
+            break
+        for edge in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance, neighbor))
+    _count_search(metrics, pops, settled, len(priority_queue))
+    return dist, predecessors
+
+# Dijkstra bidirectionnel : une recherche depuis la source, une autre depuis la cible sur le graphe transposé.
+# On développe le côté dont le tas a le plus petit minimum, et on s'arrête quand la somme
+# des deux minimums dépasse le meilleur chemin déjà rencontré.
+# Retourne (distance, chemin en identifiants) ; (inf, []) si la cible est inaccessible.
+def bidirectional_dijkstra(graph, source, target, metrics=None):
+    with phase(metrics, "dijkstra.search"):
+        return _bidirectional_dijkstra(graph, source, target, metrics)
+
+def _bidirectional_dijkstra(graph, source, target, metrics):
+    if source == target:
+        return 0.0, [source]
+    sides = []
+    for side_graph, origin in ((graph, source), (graph.reverse(), target)):
+        dist = np.full(graph.num_nodes, np.inf)
+        predecessors = np.full(graph.num_nodes, -1, dtype=np.int64)
+        dist[origin] = 0
+        sides.append((memoryview(side_graph.indptr), memoryview(side_graph.indices), memoryview(side_graph.weights),
+                      memoryview(dist), memoryview(predecessors), [(0.0, origin)], predecessors))
+    best, meeting = math.inf, -1
+    pops = settled = 0
+    while sides[0][5] and sides[1][5]:
+        if sides[0][5][0][0] + sides[1][5][0][0] >= best:
+            break
+        side = 0 if sides[0][5][0][0] <= sides[1][5][0][0] else 1
+        indptr, indices, weights, distances, previous, priority_queue, _ = sides[side]
+        other_distances = sides[1 - side][3]
+        current_distance, current_node = heapq.heappop(priority_queue)
+        pops += 1
+        if current_distance > distances[current_node]:
+            continue
+        settled += 1
+        for edge in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance, neighbor))
+            total = distance + other_distances[neighbor]
+            if total < best:
+                best, meeting = total, neighbor
+    _count_search(metrics, pops, settled, len(sides[0][5]) + len(sides[1][5]), initial=2)
+    if meeting == -1:
+        return math.inf, []
+    forward = _path_ids(sides[0][6], meeting)
+    backward = _path_ids(sides[1][6], meeting)  # De la cible vers le point de rencontre
+    return best, forward + backward[-2::-1]
+
+# A* : Dijkstra guidé par une heuristique h(nœud) qui minore la distance restante jusqu'à la cible.
+# L'heuristique doit être cohérente (h(u) <= w(u, v) + h(v)) pour que chaque nœud ne soit fixé qu'une fois.
+# Retourne (distance, chemin en identifiants) ; (inf, []) si la cible est inaccessible.
+def astar(graph, source, target, heuristic, metrics=None):
+    with phase(metrics, "dijkstra.search"):
+        return _astar(graph, source, target, heuristic, metrics)
+
+def _astar(graph, source, target, heuristic, metrics):
+    dist = np.full(graph.num_nodes, np.inf)
+    predecessors = np.full(graph.num_nodes, -1, dtype=np.int64)
+    indptr, indices, weights = memoryview(graph.indptr), memoryview(graph.indices), memoryview(graph.weights)
+    distances, previous = memoryview(dist), memoryview(predecessors)
+    distances[source] = 0
+    priority_queue = [(heuristic(source), 0.0, source)]
+    pops = settled = 0
+    while priority_queue:
+        _, current_distance, current_node = heapq.heappop(priority_queue)
+        pops += 1
+        if current_distance > distances[current_node]:
+            continue
+        settled += 1
+        if current_node == target:
+            _count_search(metrics, pops, settled, len(priority_queue))
+            return current_distance, _path_ids(predecessors, target)
+        for edge in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance + heuristic(neighbor), distance, neighbor))
+    _count_search(metrics, pops, settled, 0)
+    return math.inf, []
+
+# Heuristique euclidienne à partir des coordonnées des nœuds (tableaux x et y).
+# scale doit minorer le rapport poids / longueur de chaque arête pour rester admissible.
+def euclidean_heuristic(x, y, target, scale=1.0):
+    x, y = memoryview(np.ascontiguousarray(x, dtype=np.float64)), memoryview(np.ascontiguousarray(y, dtype=np.float64))
+    target_x, target_y = x[target], y[target]
+    return lambda node: scale * math.hypot(x[node] - target_x, y[node] - target_y)
+
+# Repères (landmarks) pour l'heuristique ALT : on choisit à chaque fois le nœud le plus éloigné
+# des repères déjà retenus, ce qui couvre bien les bords du graphe. Graphe non orienté.
+# Retourne les repères et le tableau de leurs distances (repères x nœuds).
+def select_landmarks(graph, count, seed=0):
+    rng = np.random.default_rng(seed)
+    landmark = int(rng.integers(graph.num_nodes))
+    landmarks, rows = [], []
+    nearest = np.full(graph.num_nodes, np.inf)
+    for _ in range(min(count, graph.num_nodes)):
+        dist, _ = dijkstra_csr(graph, landmark)
+        landmarks.append(landmark)
+        rows.append(dist)
+        np.minimum(nearest, dist, out=nearest)
+        reachable = np.where(np.isfinite(nearest), nearest, -1)
+        landmark = int(np.argmax(reachable))
+        if reachable[landmark] <= 0:  # Tous les nœuds accessibles sont déjà des repères
+            break
+    return np.array(landmarks), np.vstack(rows)
+
+# Heuristique ALT (inégalité triangulaire) : h(v) = max sur les repères L de |d(L, cible) - d(L, v)|
+def landmark_heuristic(landmark_distances, target):
+    rows = [(memoryview(row), row[target]) for row in landmark_distances if np.isfinite(row[target])]
+    return lambda node: max((abs(target_distance - row[node]) for row, target_distance in rows), default=0.0)
+
+# Plus court chemin point à point (noms de nœuds), avec arrêt dès que la cible est atteinte.
+# method : "dijkstra", "bidirectional" ou "astar" (heuristic est alors une fonction de fabrique
+# heuristic(graph, target) -> h, par exemple lambda g, t: landmark_heuristic(table, t)).
+# Retourne (distance, chemin) ; (inf, []) si aucun chemin.
+def shortest_path(graph, start, end, method="bidirectional", heuristic=None, metrics=None):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    source, target = graph.node_id(start), graph.node_id(end)
+    if method == "dijkstra":
+        dist, predecessors = dijkstra_csr(graph, source, target, metrics)
+        distance, path = (float(dist[target]), _path_ids(predecessors, target)) if dist[target] != np.inf else (math.inf, [])
+    elif method == "bidirectional":
+        distance, path = bidirectional_dijkstra(graph, source, target, metrics)
+    elif method == "astar":
+        distance, path = astar(graph, source, target, heuristic(graph, target) if heuristic else lambda node: 0.0, metrics)
+    else:
+        raise ValueError(f"Méthode inconnue : {method}")
+    return distance, [graph.node_name(node) for node in path]
 
 # Fonction pour implémenter l'algorithme de Dijkstra avec un tas binaire
-def dijkstra(graph, start, end):
+# Accepte un CSRGraph ou le format dictionnaire {nœud: {voisin: poids}} (converti une fois en CSR)
+def dijkstra(graph, start, end, metrics=None):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    source, target = graph.node_id(start), graph.node_id(end)
+    dist_array, predecessors = dijkstra_csr(graph, source, metrics=metrics)
+    values = dist_array.tolist()
+    if graph._integer_weights:
+        # Poids entiers : mêmes distances int qu'avec dijkstra_dict (inf reste un flottant)
+        values = [int(value) if value != math.inf else value for value in values]
+    dist = {graph.node_name(node): value for node, value in enumerate(values)}
+    if dist_array[target] == np.inf:
+        return dist, [end]  # Pas de chemin : seul le nœud d'arrivée, comme auparavant
+    return dist, graph.path(predecessors, target)  # Retourne les distances et le chemin trouvé
+
+DENSE_NODE_LIMIT = 1000  # En dessous, calcul matriciel (scipy.sparse.csgraph ou Floyd–Warshall) plutôt que des Dijkstra
+SOURCES_PER_TASK = 16  # Sources traitées par tâche du pool de processus
+
+_worker_graph = None  # Graphe rattaché à la mémoire partagée dans chaque processus du pool
+
+def _attach_shared_graph(specs):
+    # Initialisation d'un processus du pool : vues NumPy sur les blocs de mémoire partagée, sans copie
+    global _worker_graph
+    memories = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    arrays = [np.ndarray(shape, dtype=dtype, buffer=memory.buf) for memory, (_, shape, dtype) in zip(memories, specs)]
+    _worker_graph = CSRGraph(*arrays)
+    _worker_graph._memories = memories  # Garder les blocs ouverts tant que le processus vit
+
+def _distance_rows(sources, targets, graph=None):
+    graph = graph or _worker_graph
+    rows = np.empty((len(sources), graph.num_nodes if targets is None else len(targets)))
+    for row, source in enumerate(sources):
+        dist, _ = dijkstra_csr(graph, source)
+        rows[row] = dist if targets is None else dist[targets]
+    return rows
+
+def _scipy_matrix(graph):
+    # Matrice creuse scipy ; les arêtes parallèles sont réduites à la plus légère (scipy les additionnerait)
+    from scipy.sparse import csr_matrix
+    sources = graph.edge_sources()
+    order = np.lexsort((graph.weights, graph.indices, sources))
+    sources, targets, weights = sources[order], graph.indices[order], graph.weights[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    return csr_matrix((weights[first], (sources[first], targets[first])), shape=(graph.num_nodes, graph.num_nodes))
+
+def floyd_warshall(graph):
+    # Floyd–Warshall vectorisé : une mise à jour matricielle par nœud intermédiaire, O(n³) mais sans boucle Python interne
+    matrix = np.full((graph.num_nodes, graph.num_nodes), np.inf)
+    np.minimum.at(matrix, (graph.edge_sources(), graph.indices), graph.weights)
+    np.fill_diagonal(matrix, 0)
+    for middle in range(graph.num_nodes):
+        np.minimum(matrix, matrix[:, middle, None] + matrix[None, middle, :], out=matrix)
+    return matrix
+
+# Matrice NumPy des distances sources x cibles (noms des nœuds ; targets=None : tous les nœuds, dans l'ordre des identifiants).
+# Petits graphes : calcul matriciel ; sinon un Dijkstra par source, réparti sur un pool de processus
+# qui lisent le graphe en mémoire partagée.
+def distance_matrix(graph, sources, targets=None, workers=None):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    sources = np.array([graph.node_id(source) for source in sources], dtype=np.int64)
+    targets = None if targets is None else np.array([graph.node_id(target) for target in targets], dtype=np.int64)
+    if graph.num_nodes <= DENSE_NODE_LIMIT:
+        try:
+            from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+            matrix = csgraph_dijkstra(_scipy_matrix(graph), indices=sources)
+        except ImportError:  # scipy absent : Floyd–Warshall en NumPy
+            matrix = floyd_warshall(graph)[sources]
+        return matrix if targets is None else matrix[:, targets]
+
+    workers = workers or os.cpu_count()
+    chunks = [sources[i:i + SOURCES_PER_TASK].tolist() for i in range(0, len(sources), SOURCES_PER_TASK)]
+    if workers == 1 or len(chunks) <= 1:
+        width = graph.num_nodes if targets is None else len(targets)
+        return np.vstack([_distance_rows(chunk, targets, graph) for chunk in chunks] or [np.empty((0, width))])
+
+    memories, specs = [], []
+    try:
+        for array in (graph.indptr, graph.indices, graph.weights):
+            memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            memories.append(memory)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+            specs.append((memory.name, array.shape, array.dtype.str))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_graph, initargs=(specs,)) as executor:
+            return np.vstack(list(executor.map(_distance_rows, chunks, [targets] * len(chunks))))
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+# Plus proche équipement (multi-source) : un seul Dijkstra partant de tous les équipements (noms) à la fois.
+# Retourne deux tableaux indexés par identifiant de nœud : distance au plus proche équipement,
+# et position de celui-ci dans facilities (-1 si inaccessible).
+def nearest_facility(graph, facilities):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    facilities = [graph.node_id(facility) for facility in facilities]
+    dist = np.full(graph.num_nodes, np.inf)
+    nearest = np.full(graph.num_nodes, -1, dtype=np.int64)
+    indptr, indices, weights = memoryview(graph.indptr), memoryview(graph.indices), memoryview(graph.weights)
+    distances, owners = memoryview(dist), memoryview(nearest)
+    priority_queue = []
+    for position, facility in enumerate(facilities):
+        if distances[facility] > 0:
+            distances[facility] = 0
+            owners[facility] = position
+            priority_queue.append((0.0, facility))
+    heapq.heapify(priority_queue)
+    while priority_queue:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if current_distance > distances[current_node]:
+            continue
+        owner = owners[current_node]
+        for edge in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                owners[neighbor] = owner
+                heapq.heappush(priority_queue, (distance, neighbor))
+    return dist, nearest
+
+# Version historique sur dictionnaires (référence pour les mesures de performance)
+def dijkstra_dict(graph, start, end):
     # Initialisation des distances avec une valeur infinie pour tous les nœuds
     dist = {node: float('inf') for node in graph}
     dist[start] = 0  # La distance au nœud de départ est définie à 0
@@ -45,25 +449,102 @@ def dijkstra(graph, start, end):
     path.reverse()  # Inverser le chemin pour qu'il soit dans le bon ordre
     return dist, path  # Retourne les distances et le chemin trouvé
 
+DRAW_NODE_LIMIT = 300  # Au-delà, seul un échantillon connexe du graphe est dessiné
+DRAW_EDGE_LIMIT = 1_000_000  # Au-delà (arêtes orientées du CSR), pas de dessin : l'échantillonnage parcourt toutes les arêtes
+LABEL_NODE_LIMIT = 30  # Au-delà, pas d'étiquettes (illisibles et coûteuses à placer)
+LAYOUT_CACHE_SIZE = 16
+
+_layout_cache = LRUCache(LAYOUT_CACHE_SIZE)  # Empreinte du sous-graphe dessiné -> positions des nœuds
+
+def graph_fingerprint(graph, nodes=None):
+    # Empreinte du contenu d'un graphe CSR (et de l'échantillon de nœuds dessiné)
+    # Le contenu n'est haché qu'une fois par graphe : les tableaux d'un CSRGraph ne sont pas modifiés après construction
+    if graph._fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (graph.indptr, graph.indices, graph.weights):
+            digest.update(array.tobytes())
+        graph._fingerprint = digest.hexdigest()
+    if nodes is None:
+        return graph._fingerprint
+    digest = hashlib.blake2b(graph._fingerprint.encode(), digest_size=16)
+    digest.update(np.asarray(nodes, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+def sample_nodes(graph, max_nodes):
+    # Échantillon par parcours en largeur jusqu'à max_nodes nœuds (composantes suivantes si la première est trop petite)
+    indptr, indices = memoryview(graph.indptr), memoryview(graph.indices)
+    seen = set()
+    for start in range(graph.num_nodes):
+        if len(seen) == max_nodes:
+            break
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = [start]
+        for node in queue:
+            for edge in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[edge]
+                if neighbor not in seen and len(seen) < max_nodes:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+    return np.array(sorted(seen))
+
 # Fonction pour afficher un graphe avec NetworkX
-def draw_graph(graph):
+# Accepte un dictionnaire ou un CSRGraph ; au-delà de max_nodes nœuds, seul un échantillon est dessiné
+# (max_nodes=0 : pas de dessin). La disposition est mise en cache : un nouvel affichage ne la recalcule pas.
+def draw_graph(graph, max_nodes=DRAW_NODE_LIMIT, max_edges=DRAW_EDGE_LIMIT):
+    import streamlit as st  # Pour créer une interface utilisateur interactive
+    import networkx as nx  # Pour manipuler et visualiser des graphes
+    import matplotlib.pyplot as plt  # Pour afficher les graphes créés avec NetworkX
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    if graph.num_nodes == 0:
+        return
+    if max_nodes == 0:
+        st.info(f"Graphe de {graph.num_nodes} nœuds et {graph.num_edges} arêtes : affichage désactivé.")
+        return
+    if graph.num_edges > max_edges:
+        st.info(f"Graphe de {graph.num_nodes} nœuds et {graph.num_edges} arêtes : trop grand pour être dessiné "
+                f"(limite : {max_edges} arêtes).")
+        return
+    sampled = graph.num_nodes > max_nodes
+    nodes = sample_nodes(graph, max_nodes) if sampled else np.arange(graph.num_nodes)
+
+    # Arêtes dont les deux extrémités sont dans l'échantillon (poids nuls déjà exclus par le CSR)
+    sources = graph.edge_sources()
+    keep = np.isin(sources, nodes) & np.isin(graph.indices, nodes) if sampled else slice(None)
     G = nx.Graph()  # Initialiser un graphe NetworkX
-    # Ajouter les arêtes au graphe
-    for node, neighbors in graph.items():
-        for neighbor, weight in neighbors.items():
-            if weight > 0:  # Ignorer les arêtes avec un poids nul
-                G.add_edge(node, neighbor, weight=weight)
-    
-    pos = nx.spring_layout(G)  # Calculer la disposition des nœuds
-    labels = nx.get_edge_attributes(G, 'weight')  # Obtenir les poids des arêtes
-    
-    plt.figure(figsize=(8, 6))  # Définir la taille de la figure
-    nx.draw(G, pos, with_labels=True, node_size=2000, node_color="#9b111e", edge_color="gray", font_size=12)
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=labels)  # Ajouter les étiquettes des arêtes
-    st.pyplot(plt)  # Afficher le graphe dans l'application Streamlit
+    G.add_nodes_from(graph.node_name(node) for node in nodes.tolist())
+    for source, target, weight in zip(sources[keep].tolist(), graph.indices[keep].tolist(), graph.weights[keep].tolist()):
+        G.add_edge(graph.node_name(source), graph.node_name(target), weight=int(weight) if weight.is_integer() else weight)
+
+    if graph.coordinates is not None:  # Graphe géométrique : les coordonnées servent de disposition
+        pos = {graph.node_name(node): graph.coordinates[node] for node in nodes.tolist()}
+    else:
+        key = graph_fingerprint(graph, nodes if sampled else None)
+        pos = _layout_cache.get(key)
+        if pos is MISSING:
+            pos = nx.spring_layout(G, seed=0)  # Calculer la disposition des nœuds
+            _layout_cache.put(key, pos)
+
+    labelled = len(nodes) <= LABEL_NODE_LIMIT
+    figure = plt.figure(figsize=(8, 6))  # Définir la taille de la figure
+    if labelled:
+        nx.draw(G, pos, with_labels=True, node_size=2000, node_color="#9b111e", edge_color="gray", font_size=12)
+        labels = nx.get_edge_attributes(G, 'weight')  # Obtenir les poids des arêtes
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=labels)  # Ajouter les étiquettes des arêtes
+    else:
+        nx.draw(G, pos, with_labels=False, node_size=max(10, 20000 // len(nodes)), node_color="#9b111e",
+                edge_color="gray", width=0.5)
+    st.pyplot(figure)  # Afficher le graphe dans l'application Streamlit
+    plt.close(figure)
+    if sampled:
+        st.caption(f"Aperçu : {len(nodes)} nœuds sur {graph.num_nodes} ({graph.num_edges // 2} arêtes au total).")
 
 # Fonction pour générer un graphe avec des nœuds et des distances aléatoires
-def generate_random_graph(num_nodes):
+# seed fixe le tirage : le même graphe est régénéré à chaque exécution du script
+def generate_random_graph(num_nodes, seed=None):
+    rng = random.Random(seed)
     # Générer des noms pour les nœuds
     node_names = [f"Node{i+1}" for i in range(num_nodes)]
     graph = {node: {} for node in node_names}  # Initialiser le graphe
@@ -71,14 +552,49 @@ def generate_random_graph(num_nodes):
     # Ajouter des distances aléatoires entre les nœuds
     for i in range(num_nodes):
         for j in range(i + 1, num_nodes):
-            distance = random.randint(1, 10)  # Générer une distance entre 1 et 10
+            distance = rng.randint(1, 10)  # Générer une distance entre 1 et 10
             graph[node_names[i]][node_names[j]] = distance
             graph[node_names[j]][node_names[i]] = distance
 
     return node_names, graph  # Retourner les noms des nœuds et le graphe généré
 
+def _undirected_csr(sources, targets, weights, num_nodes):
+    # Arêtes non orientées : chaque paire est stockée dans les deux sens
+    return CSRGraph.from_edges(np.concatenate([sources, targets]), np.concatenate([targets, sources]),
+                               np.concatenate([weights, weights]), num_nodes)
+
+# Graphe creux aléatoire non orienté de degré moyen donné, construit par tirages NumPy vectorisés.
+# kind="erdos_renyi" : paires de nœuds tirées uniformément (sans boucle ni doublon).
+# kind="geometric" : points uniformes dans le carré unité, reliés s'ils sont à moins d'un rayon choisi
+# pour obtenir le degré moyen ; le poids croît avec la distance et les coordonnées sont conservées.
+# Les poids sont des entiers de 1 à max_weight ; les nœuds sont identifiés par leur numéro.
+def generate_sparse_graph(num_nodes, degree=4, kind="erdos_renyi", seed=None, max_weight=10):
+    rng = np.random.default_rng(seed)
+    if kind == "erdos_renyi":
+        edge_count = int(num_nodes * degree / 2)
+        sources = rng.integers(num_nodes, size=edge_count, dtype=np.int64)
+        targets = rng.integers(num_nodes, size=edge_count, dtype=np.int64)
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        pairs = np.unique(low[low != high] * num_nodes + high[low != high])
+        sources, targets = pairs // num_nodes, pairs % num_nodes
+        weights = rng.integers(1, max_weight + 1, size=len(pairs)).astype(np.float64)
+        return _undirected_csr(sources, targets, weights, num_nodes)
+    if kind == "geometric":
+        from scipy.spatial import cKDTree
+        points = rng.random((num_nodes, 2))
+        radius = math.sqrt(degree / (math.pi * max(num_nodes - 1, 1)))
+        pairs = cKDTree(points).query_pairs(radius, output_type="ndarray")
+        sources, targets = pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64)
+        lengths = np.hypot(*(points[sources] - points[targets]).T)
+        weights = np.maximum(1, np.ceil(lengths / radius * max_weight))
+        graph = _undirected_csr(sources, targets, weights, num_nodes)
+        graph.coordinates = points
+        return graph
+    raise ValueError(f"Type de graphe inconnu : {kind}")
+
 # Interface Streamlit
 def app():
+    import streamlit as st  # Pour créer une interface utilisateur interactive
     st.title("Application Dijkstra avec Tas Binaire et Graphe Dynamique")  # Titre de l'application
 
     # Demander à l'utilisateur s'il veut générer des noms de nœuds et des distances aléatoires
@@ -88,9 +604,10 @@ def app():
     if choix == "Générer des nœuds et distances aléatoires":
         # Entrée du nombre de nœuds
         num_nodes = st.number_input("Nombre de nœuds", min_value=2, step=1, key="num_nodes")
+        seed = st.number_input("Graine du tirage", min_value=0, step=1, key="seed")  # Même graine = même graphe
 
         # Générer un graphe avec des nœuds et distances aléatoires
-        node_names, graph = generate_random_graph(num_nodes)
+        node_names, graph = generate_random_graph(num_nodes, seed)
 
         # Affichage du graphe généré
         st.write("### Graphe généré aléatoirement :")
@@ -0,0 +1,104 @@
+import sys
+from collections import Counter, defaultdict
+
+# Recherche floue de mots : index de trigrammes avec filtrage des candidats, puis vérification
+# par la distance d'édition avec transpositions (alignement optimal). Une insertion, suppression ou
+# substitution fait perdre au plus 3 trigrammes du mot cherché, une transposition de deux lettres
+# voisines au plus 4 : un mot à distance d partage donc au moins (trigrammes distincts du mot
+# cherché) - 4 * d trigrammes, seuls ces candidats sont comparés.
+
+GRAM_SIZE = 3
+GRAMS_PER_EDIT = GRAM_SIZE + 1  # Trigrammes perdus au plus par opération (transposition)
+
+def trigrams(word):
+    # Trigrammes distincts du mot entouré de marqueurs de début et de fin
+    padded = "\0" * (GRAM_SIZE - 1) + word + "\0" * (GRAM_SIZE - 1)
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+def edit_distance(a, b, max_distance=None):
+    # Distance d'alignement optimal (Damerau restreinte) ligne par ligne : insertions, suppressions,
+    # substitutions et transpositions de deux lettres voisines (« quikc » -> « quick » : une seule opération)
+    # Avec max_distance, le calcul s'arrête dès que la distance dépasse forcément ce seuil
+    if len(a) < len(b):
+        a, b = b, a
+    before = None  # Ligne i - 2, pour les transpositions
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b and char_a != char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        before, previous = previous, current
+    return previous[-1]
+
+class TrigramIndex:
+    def __init__(self, words=()):
+        self.words = []  # Identifiant -> mot
+        self.word_ids = {}  # Mot -> identifiant
+        self.postings = defaultdict(list)  # Trigramme -> identifiants des mots qui le contiennent
+        self.by_length = defaultdict(list)  # Longueur -> identifiants (mots trop courts pour le filtrage)
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        # Mise à jour incrémentale : appelée pour chaque nouveau mot du vocabulaire
+        if word in self.word_ids:
+            return
+        word_id = len(self.words)
+        self.word_ids[word] = word_id
+        self.words.append(word)
+        self.by_length[len(word)].append(word_id)
+        for gram in trigrams(word):
+            self.postings[gram].append(word_id)
+
+    def search(self, word, max_distance):
+        # Tous les mots à une distance <= max_distance : liste de (distance, mot)
+        grams = trigrams(word)
+        threshold = len(grams) - GRAMS_PER_EDIT * max_distance
+        if threshold > 0:
+            counts = Counter()
+            for gram in grams:
+                counts.update(self.postings.get(gram, ()))
+            candidates = [word_id for word_id, count in counts.items() if count >= threshold]
+        else:
+            # Mot trop court : le filtrage par trigrammes n'élimine rien, on filtre par longueur
+            candidates = [word_id for length in range(max(0, len(word) - max_distance), len(word) + max_distance + 1)
+                          for word_id in self.by_length.get(length, ())]
+        results = []
+        for word_id in candidates:
+            candidate = self.words[word_id]
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((distance, candidate))
+        return results
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def nbytes(self):
+        # Mémoire des tables (les mots sont partagés avec le vocabulaire de l'index, ils ne sont pas comptés ;
+        # chaque identifiant est un entier partagé entre toutes les listes qui le contiennent)
+        tables = (self.postings, self.by_length)
+        return (sys.getsizeof(self.words) + sys.getsizeof(self.word_ids) + sys.getsizeof(0) * len(self.words)
+                + sum(sys.getsizeof(table) + sum(sys.getsizeof(key) + sys.getsizeof(ids) for key, ids in table.items())
+                      for table in tables))
+
+def similar_words(index, word, cutoff=0.8, n=5):
+    # Équivalent de difflib.get_close_matches : similarité = 1 - distance / longueur du plus long mot
+    if not word:
+        return []
+    # Une distance d implique une similarité <= 1 - d / (len(word) + d) : au-delà de ce rayon, inutile de chercher
+    max_distance = int((1 - cutoff) * len(word) / cutoff + 1e-9)  # Marge pour les arrondis flottants
+    scored = []
+    for distance, candidate in index.search(word, max_distance):
+        similarity = 1 - distance / max(len(word), len(candidate))
+        if similarity >= cutoff:
+            scored.append((-similarity, candidate))
+    return [candidate for _, candidate in sorted(scored)[:n]]
@@ -1,11 +1,14 @@
-import streamlit as st
 from collections import Counter
 import heapq
-import pandas as pd  # Pour créer et afficher le tableau
-import matplotlib.pyplot as plt
-import networkx as nx
+import os
+import numpy as np
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
 import re
+from cache import MISSING, LRUCache
+from instrumentation import count, phase
 
 # Classe pour représenter les nœuds de l'arbre
 class Node:
@@ -24,69 +27,220 @@ class Node:
 
 
 
-def calculate_frequency(text):
-    # Conserver uniquement les caractères alphanumériques, les accents, les espaces et les signes de ponctuation spécifiés
-    cleaned_text = re.sub(r"[^a-zA-Z0-9 .!,;:éèàç?']", '', text)  # Inclut les caractères accentués et la ponctuation choisie
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()  # Remplace plusieurs espaces par un seul et supprime les espaces aux extrémités
-    
-    frequencies = {}
-    for char in cleaned_text:
-        frequencies[char] = frequencies.get(char, 0) + 1
-    return frequencies
+# metrics (instrumentation.Metrics, optionnel) : durée des phases de comptage, arbre, codes, encodage et décodage
+def calculate_frequency(text, clean=False, metrics=None):
+    # Par défaut tous les caractères sont comptés (accents, retours à la ligne...) : la décompression restitue le texte exact
+    with phase(metrics, "huffman.frequency"):
+        if clean:
+            # Conserver uniquement les caractères alphanumériques, les accents, les espaces et les signes de ponctuation spécifiés
+            text = re.sub(r"[^a-zA-Z0-9 .!,;:éèàç?']", '', text)  # Inclut les caractères accentués et la ponctuation choisie
+            text = re.sub(r'\s+', ' ', text).strip()  # Remplace plusieurs espaces par un seul et supprime les espaces aux extrémités
+        return dict(Counter(text))
+
+# Fréquences des octets (données binaires ou texte encodé) avec NumPy
+def calculate_frequency_bytes(data):
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    return {bytes([byte]): int(counts[byte]) for byte in np.flatnonzero(counts)}
 
 
 
 # Construction de l'arbre de Huffman
-def build_huffman_tree(frequencies):
-    # Trier les caractères par fréquence (ordre croissant)
-    heap = [Node(char, freq) for char, freq in sorted(frequencies.items(), key=lambda item: item[1])]
-    heapq.heapify(heap)
-    
-    while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = Node(None, left.freq + right.freq)
-        merged.left = left
-        merged.right = right
-        heapq.heappush(heap, merged)
-    
-    return heap[0]
-
-# Fonction récursive pour tracer l'arbre de Huffman avec étiquettes sur les arêtes
-def plot_huffman_tree(node, graph=None, pos=None, x=0, y=0, layer=1, parent=None, edge_label=None, leaf_positions=None):
-    if graph is None:
-        graph = nx.DiGraph()
-        pos = {}
-        leaf_positions = {}
-
-    if node.char:
-        label = f"{node.char}:{node.freq}"
-        # Placer les feuilles (les caractères) de manière horizontale (de gauche à droite)
-        leaf_positions[node.char] = (x, y)
+def build_huffman_tree(frequencies, metrics=None):
+    with phase(metrics, "huffman.tree"):
+        # Trier les caractères par fréquence (ordre croissant)
+        heap = [Node(char, freq) for char, freq in sorted(frequencies.items(), key=lambda item: item[1])]
+        heapq.heapify(heap)
+
+        while len(heap) > 1:
+            left = heapq.heappop(heap)
+            right = heapq.heappop(heap)
+            merged = Node(None, left.freq + right.freq)
+            merged.left = left
+            merged.right = right
+            heapq.heappush(heap, merged)
+
+        return heap[0]
+
+# --- Visualisation de l'arbre ---
+# L'arbre affiché est reconstruit à partir de la table des codes (un nœud par préfixe, identifiant entier unique) :
+# deux nœuds de même fréquence ne se confondent plus, et l'image peut être mise en cache par table de codes.
+# Au-delà de max_leaves feuilles, seuls les sous-arbres les plus lourds sont développés ; les autres sont
+# repliés en un nœud « … n symboles ». Tous les parcours utilisent une pile explicite (pas de récursion).
+TREE_DRAW_LEAF_LIMIT = 64  # Feuilles affichées au plus (feuilles réelles + sous-arbres repliés)
+TREE_LABEL_LEAF_LIMIT = 128  # Au-delà, pas d'étiquettes (illisibles et coûteuses à placer)
+TREE_IMAGE_CACHE_SIZE = 8
+
+_tree_image_cache = LRUCache(TREE_IMAGE_CACHE_SIZE)  # Empreinte (codes, fréquences, limite) -> image PNG
+
+def _code_trie(codes):
+    # Nœud 0 = racine ; children[i] = [gauche, droite] (-1 si absent) ; symbols[i] = caractère d'une feuille
+    # Un enfant est toujours créé après son parent : l'ordre inverse des identifiants remonte l'arbre
+    children, symbols = [[-1, -1]], [None]
+    for char, code in codes.items():
+        node = 0
+        for bit in code:
+            side = bit == "1"
+            if children[node][side] == -1:
+                children[node][side] = len(children)
+                children.append([-1, -1])
+                symbols.append(None)
+            node = children[node][side]
+        symbols[node] = char
+    return children, symbols
+
+def _symbol_label(char):
+    # Espaces et caractères invisibles affichés sous forme échappée (' ', '\n'...)
+    return char if char.isprintable() and not char.isspace() else repr(char)
+
+def huffman_tree_layout(codes, frequencies=None, max_leaves=TREE_DRAW_LEAF_LIMIT):
+    # Disposition « tidy » : feuilles visibles espacées régulièrement de gauche à droite (ordre des codes),
+    # chaque nœud interne centré au-dessus de ses enfants, profondeur = -y.
+    # Retourne (positions {id: (x, y)}, arêtes [(parent, enfant, "0" | "1")], étiquettes {id: texte},
+    # nœuds repliés {id: nombre de symboles}).
+    if not codes:
+        return {}, [], {}, {}
+    children, symbols = _code_trie(codes)
+    weight = [0] * len(children)  # Somme des fréquences (ou nombre de symboles sans fréquences)
+    size = [0] * len(children)  # Nombre de symboles du sous-arbre
+    for node in range(len(children) - 1, -1, -1):
+        if symbols[node] is not None:
+            weight[node] = frequencies.get(symbols[node], 0) if frequencies else 1
+            size[node] = 1
+        for child in children[node]:
+            if child != -1:
+                weight[node] += weight[child]
+                size[node] += size[child]
+
+    # Développer les sous-arbres du plus lourd au plus léger tant que la limite de feuilles visibles le permet
+    expanded = set()
+    visible = 1
+    candidates = [(-weight[0], 0)] if symbols[0] is None else []
+    while candidates:
+        _, node = heapq.heappop(candidates)
+        node_children = [child for child in children[node] if child != -1]
+        if visible + len(node_children) - 1 > max_leaves and expanded:
+            break
+        expanded.add(node)
+        visible += len(node_children) - 1
+        for child in node_children:
+            if symbols[child] is None:
+                heapq.heappush(candidates, (-weight[child], child))
+
+    positions, edges, labels, collapsed = {}, [], {}, {}
+    next_x = 0
+    stack = [(0, 0, False)]
+    while stack:
+        node, depth, done = stack.pop()
+        if node in expanded:
+            node_children = [child for child in children[node] if child != -1]
+            if not done:
+                stack.append((node, depth, True))
+                for child in reversed(node_children):  # Gauche dépilé en premier
+                    stack.append((child, depth + 1, False))
+                continue
+            positions[node] = (sum(positions[child][0] for child in node_children) / len(node_children), -depth)
+            labels[node] = str(weight[node]) if frequencies else ""
+            for side, child in enumerate(children[node]):
+                if child != -1:
+                    edges.append((node, child, str(side)))
+            continue
+        positions[node] = (next_x, -depth)
+        next_x += 1
+        if symbols[node] is not None:
+            labels[node] = f"{_symbol_label(symbols[node])}:{weight[node]}" if frequencies else _symbol_label(symbols[node])
+        else:
+            collapsed[node] = size[node]
+            labels[node] = f"… {size[node]} symboles"
+    return positions, edges, labels, collapsed
+
+def render_huffman_tree(codes, frequencies=None, max_leaves=TREE_DRAW_LEAF_LIMIT, metrics=None):
+    # Image PNG de l'arbre, dessinée en une seule fois et mise en cache par table de codes
+    digest = hashlib.blake2b(digest_size=16)
+    for char, code in sorted(codes.items()):
+        digest.update(f"{char}\0{code}\0{frequencies.get(char, 0) if frequencies else ''}\0".encode("utf-8", "surrogatepass"))
+    digest.update(str(max_leaves).encode())
+    key = digest.hexdigest()
+    image = _tree_image_cache.get(key)
+    if image is not MISSING:
+        count(metrics, "huffman.render_cache_hits")
+        return image
+    with phase(metrics, "huffman.render"):
+        image = _draw_tree(codes, frequencies, max_leaves)
+    _tree_image_cache.put(key, image)
+    return image
+
+def _draw_tree(codes, frequencies, max_leaves):
+    from matplotlib.figure import Figure  # Import local : seul l'affichage en a besoin (pas d'état global pyplot)
+    from matplotlib.collections import LineCollection
+    positions, edges, labels, collapsed = huffman_tree_layout(codes, frequencies, max_leaves)
+    leaves = set(positions) - {parent for parent, _, _ in edges}
+    depth = -min(y for _, y in positions.values())
+    figure = Figure(figsize=(min(max(8, 0.45 * len(leaves)), 40), min(max(5, 0.8 * (depth + 1)), 30)))
+    axes = figure.add_subplot()
+    axes.axis("off")
+    axes.add_collection(LineCollection([(positions[parent], positions[child]) for parent, child, _ in edges],
+                                       colors="gray", linewidths=0.8, zorder=1))
+    labelled = len(leaves) <= TREE_LABEL_LEAF_LIMIT
+    if labelled:
+        for parent, child, bit in edges:
+            (x1, y1), (x2, y2) = positions[parent], positions[child]
+            axes.text((x1 + x2) / 2, (y1 + y2) / 2, bit, fontsize=9, color="#9b111e", ha="center", va="center",
+                      bbox=dict(boxstyle="circle,pad=0.1", facecolor="white", edgecolor="none"), zorder=2)
+        for node, (x, y) in positions.items():
+            axes.text(x, y, labels[node] or " ", fontsize=8, color="white", fontweight="bold", ha="center", va="center",
+                      bbox=dict(boxstyle="round,pad=0.3", facecolor="gray" if node in collapsed else "#9b111e",
+                                edgecolor="none"), zorder=3)
     else:
-        label = f"{node.freq}"
-    
-    pos[label] = (x, y)
-    graph.add_node(label)
-    
-    if parent:
-        graph.add_edge(parent, label, label=edge_label)  # Ajouter l'étiquette de l'arête
-    
-    if node.left:
-        plot_huffman_tree(node.left, graph, pos, x=x - 1 / layer, y=y - 1, layer=layer * 2, parent=label, edge_label='0', leaf_positions=leaf_positions)  # Étiquette '0' pour l'arête gauche
-        
-    if node.right:
-        plot_huffman_tree(node.right, graph, pos, x=x + 1 / layer, y=y - 1, layer=layer * 2, parent=label, edge_label='1', leaf_positions=leaf_positions)  # Étiquette '1' pour l'arête droite
-        
-    return graph, pos, leaf_positions
+        points = [positions[node] for node in positions if node not in collapsed]
+        axes.scatter([x for x, _ in points], [y for _, y in points], s=8, color="#9b111e", zorder=3)
+        if collapsed:
+            axes.scatter([positions[node][0] for node in collapsed], [positions[node][1] for node in collapsed],
+                         s=16, marker="s", color="gray", zorder=3)
+    axes.autoscale_view()
+    axes.margins(0.05)
+    title = "Arbre de Huffman avec étiquettes 0 et 1"
+    if collapsed:
+        title += f" ({len(codes) - sum(collapsed.values())} symboles affichés sur {len(codes)}, sous-arbres légers repliés)"
+    axes.set_title(title)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    return buffer.getvalue()
+
+# Graphe NetworkX de l'arbre (identifiants entiers uniques, attribut label), positions et positions des feuilles
+def plot_huffman_tree(node, max_leaves=TREE_DRAW_LEAF_LIMIT):
+    import networkx as nx  # Import local : seul l'affichage en a besoin
+    codes, frequencies = {}, {}
+    stack = [(node, "")]
+    while stack:
+        current, code = stack.pop()
+        if current is None:
+            continue
+        if current.char is not None:
+            codes[current.char] = code
+            frequencies[current.char] = current.freq
+        stack.append((current.right, code + "1"))
+        stack.append((current.left, code + "0"))
+    positions, edges, labels, _ = huffman_tree_layout(codes, frequencies, max_leaves)
+    graph = nx.DiGraph()
+    for node_id in positions:
+        graph.add_node(node_id, label=labels[node_id])
+    for parent, child, bit in edges:
+        graph.add_edge(parent, child, label=bit)
+    leaves = set(positions) - {parent for parent, _, _ in edges}
+    leaf_positions = {labels[node_id]: positions[node_id] for node_id in leaves}
+    return graph, positions, leaf_positions
 
 # Définition des classes et fonctions nécessaires à l'algorithme de Huffman
 
-def generate_codes(node, current_code="", codes={}):
+def generate_codes(node, current_code="", codes=None):
+    # Nouveau dictionnaire à chaque appel (un défaut mutable serait partagé entre les fichiers)
+    if codes is None:
+        codes = {}
     if node is None:
-        return
+        return codes
     if node.char is not None:  # Feuille
-        codes[node.char] = current_code
+        # Un arbre réduit à une seule feuille reçoit le code "0" (un code vide ne serait pas décodable)
+        codes[node.char] = current_code or "0"
     generate_codes(node.left, current_code + "0", codes)
     generate_codes(node.right, current_code + "1", codes)
     return codes
@@ -105,4 +259,465 @@ def decompress(binary_data, root):
     return "".join(result)
 
 
+# --- Conteneur binaire compressé ---
+# Structure : MAGIC | version (1 octet) | bits de bourrage (1 octet) | nombre de symboles (4 octets)
+#             | table des codes | données compressées (bits empaquetés en octets)
+MAGIC = b"HUF"
+FORMAT_CODES = 1  # Table complète : symbole UTF-8 + longueur du code + bits du code
+FORMAT_CANONICAL = 2  # Codes canoniques : symbole UTF-8 + longueur du code uniquement
+FORMAT_CANONICAL_BYTES = 3  # Codes canoniques sur des octets : octet + longueur du code
+
+# Longueur du code de chaque symbole (parcours itératif de l'arbre)
+def code_lengths(root):
+    lengths = {}
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if node is None:
+            continue
+        if node.char is not None:  # Feuille
+            lengths[node.char] = max(depth, 1)  # Un arbre à une seule feuille donne un code de longueur 1
+        else:
+            stack.append((node.right, depth + 1))
+            stack.append((node.left, depth + 1))
+    return lengths
+
+# Codes de Huffman canoniques : déduits uniquement des longueurs
+def canonical_codes(lengths):
+    codes = {}
+    code = 0
+    previous_length = 0
+    # Les symboles sont numérotés par longueur croissante puis par ordre du symbole
+    for char, length in sorted(lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        codes[char] = format(code, "b").zfill(length)
+        code += 1
+        previous_length = length
+    return codes
+
+# Codes canoniques directement à partir d'une table de fréquences
+def build_codes(frequencies, metrics=None):
+    if not frequencies:
+        return {}
+    root = build_huffman_tree(frequencies, metrics)
+    with phase(metrics, "huffman.codes"):
+        return canonical_codes(code_lengths(root))
+
+def pack_bits(text, codes):
+    # Concaténer les codes puis les empaqueter 8 bits par octet
+    bits = "".join(codes[char] for char in text)
+    padding = -len(bits) % 8  # Nombre de zéros ajoutés pour compléter le dernier octet
+    if not bits:
+        return b"", 0
+    bits += "0" * padding
+    return int(bits, 2).to_bytes(len(bits) // 8, "big"), padding
+
+def unpack_bits(data, padding):
+    # Retrouver la chaîne de '0'/'1' à partir des octets empaquetés
+    if not data:
+        return ""
+    bits = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
+    return bits[:len(bits) - padding]
+
+def _write_symbol(header, char):
+    encoded = char.encode("utf-8")
+    header.append(len(encoded))
+    header += encoded
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("En-tête du fichier compressé tronqué.")
+    return data
+
+def _read_symbol(stream):
+    size = _read_exact(stream, 1)[0]
+    return _read_exact(stream, size).decode("utf-8")
+
+def _is_binary(codes):
+    # Les symboles des données binaires sont des octets (bytes de longueur 1)
+    return isinstance(next(iter(codes), ""), bytes)
+
+def build_header(codes, padding, canonical=True, binary=None):
+    # En-tête : MAGIC, version, bourrage, nombre de symboles puis la table
+    if binary is None:
+        binary = _is_binary(codes)
+    if binary and not canonical:
+        raise ValueError("Les données binaires utilisent uniquement le format canonique.")
+    header = bytearray(MAGIC)
+    header.append(FORMAT_CANONICAL_BYTES if binary else FORMAT_CANONICAL if canonical else FORMAT_CODES)
+    header.append(padding)
+    header += len(codes).to_bytes(4, "big")
+    for char, code in codes.items():
+        if binary:
+            header += char
+        else:
+            _write_symbol(header, char)
+        header.append(len(code))
+        if not canonical:
+            header += int(code, 2).to_bytes((len(code) + 7) // 8, "big")
+    return bytes(header)
+
+def compress_bytes(text, codes, canonical=True, metrics=None):
+    # Produire un fichier binaire compact : en-tête avec la table des codes puis les bits empaquetés
+    # En mode canonique, seules les longueurs sont stockées et les codes en sont redéduits
+    with phase(metrics, "huffman.encode"):
+        if canonical:
+            codes = canonical_codes({char: len(code) for char, code in codes.items()})
+        payload, padding = pack_bits(text, codes)
+        data = build_header(codes, padding, canonical) + payload
+    count(metrics, "huffman.input_chars", len(text))
+    count(metrics, "huffman.output_bytes", len(data))
+    return data
+
+def parse_header(stream):
+    # Lire l'en-tête depuis un flux binaire : retourne (version, bourrage, codes)
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Ce fichier n'est pas un fichier compressé Huffman valide.")
+    version, padding = _read_exact(stream, 2)
+    symbol_count = int.from_bytes(_read_exact(stream, 4), "big")
+    codes = {}
+    if version == FORMAT_CODES:
+        for _ in range(symbol_count):
+            char = _read_symbol(stream)
+            length = _read_exact(stream, 1)[0]
+            value = int.from_bytes(_read_exact(stream, (length + 7) // 8), "big")
+            codes[char] = format(value, "b").zfill(length)
+    elif version == FORMAT_CANONICAL:
+        lengths = {}
+        for _ in range(symbol_count):
+            char = _read_symbol(stream)
+            lengths[char] = _read_exact(stream, 1)[0]
+        codes = canonical_codes(lengths)
+    elif version == FORMAT_CANONICAL_BYTES:
+        lengths = {}
+        for _ in range(symbol_count):
+            byte, length = _read_exact(stream, 2)
+            lengths[bytes([byte])] = length
+        codes = canonical_codes(lengths)
+    else:
+        raise ValueError(f"Version de format inconnue : {version}")
+    return version, padding, codes
+
+def read_header(data):
+    # Lire l'en-tête du conteneur : retourne (version, bourrage, codes, position des données)
+    stream = io.BytesIO(data)
+    version, padding, codes = parse_header(stream)
+    return version, padding, codes, stream.tell()
+
+def build_tree_from_codes(codes):
+    # Reconstruire un arbre de décodage à partir de la table des codes
+    root = Node(None, 0)
+    for char, code in codes.items():
+        node = root
+        for bit in code:
+            if bit == "0":
+                node.left = node.left or Node(None, 0)
+                node = node.left
+            else:
+                node.right = node.right or Node(None, 0)
+                node = node.right
+        node.char = char
+    return root
+
+# --- Décodage par table (un octet à la fois) ---
+# Automate fini : chaque état est un nœud interne de l'arbre, et chaque entrée de la table donne,
+# pour un état et un octet lu, les symboles décodés et l'état suivant. Les codes à cheval sur
+# plusieurs octets sont repris grâce à l'état, sans sous-table ni manipulation de bits.
+DECODE_TABLE_BITS = 8  # Nombre de bits consommés à chaque consultation de table
+
+def build_decode_table(codes):
+    root = build_tree_from_codes(codes)
+    # Numéroter les nœuds internes (la racine est l'état 0)
+    states = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is not None and node.char is None:
+            states.append(node)
+            stack.append(node.right)
+            stack.append(node.left)
+    size = 1 << DECODE_TABLE_BITS
+    offsets = {id(node): index * size for index, node in enumerate(states)}
+    table = [None] * (len(states) * size)
+    empty = next(iter(codes))[:0]  # "" pour du texte, b"" pour des octets
+    for node in states:
+        # Développer les 2^8 suites de bits possibles niveau par niveau (bit 0 avant bit 1)
+        level = [(empty, node)]
+        for _ in range(DECODE_TABLE_BITS):
+            next_level = []
+            for chars, current in level:
+                for child in ((current.left, current.right) if current is not None else (None, None)):
+                    if child is not None and child.char is not None:  # Feuille : symbole complet
+                        next_level.append((chars + child.char, root))
+                    else:
+                        next_level.append((chars, child))
+            level = next_level
+        base = offsets[id(node)]
+        for byte, (chars, current) in enumerate(level):
+            if current is not None:  # Les suites de bits sans code valide restent à None
+                table[base + byte] = (chars, offsets[id(current)])
+    return table, states
+
+def _decode_chunk(table, state, data, empty=""):
+    # Décoder une suite d'octets complets à partir de l'état courant de l'automate
+    result = []
+    append = result.append
+    try:
+        for byte in data:
+            chars, state = table[state + byte]
+            append(chars)
+    except TypeError:
+        raise ValueError("Données compressées corrompues.") from None
+    return empty.join(result), state
+
+def _decode_last_byte(states, state, byte, padding, empty=""):
+    # Dernier octet : ne lire que les bits utiles (hors bourrage)
+    result = []
+    root = states[0]
+    node = states[state >> DECODE_TABLE_BITS]
+    for bit in format(byte, "08b")[:8 - padding]:
+        node = node.left if bit == "0" else node.right
+        if node is None:
+            raise ValueError("Données compressées corrompues.")
+        if node.char is not None:
+            result.append(node.char)
+            node = root
+    return empty.join(result)
+
+def decode_packed(payload, padding, codes):
+    # Décoder les bits empaquetés octet par octet grâce à la table de transitions
+    if not codes or not payload:
+        return b"" if codes and _is_binary(codes) else ""
+    empty = next(iter(codes))[:0]
+    table, states = build_decode_table(codes)
+    text, state = _decode_chunk(table, 0, payload[:-1], empty)
+    return text + _decode_last_byte(states, state, payload[-1], padding, empty)
+
+def decompress_bytes(data, metrics=None):
+    # Décompresser un conteneur produit par compress_bytes (ou compress_binary : le résultat est alors des octets)
+    with phase(metrics, "huffman.decode"):
+        version, padding, codes, offset = read_header(data)
+        if not codes and version == FORMAT_CANONICAL_BYTES:
+            return b""
+        return decode_packed(data[offset:], padding, codes)
+
+# --- Chemin rapide pour les données binaires (NumPy) ---
+ENCODE_CHUNK_SIZE = 1 << 18  # Nombre d'octets encodés à chaque étape vectorisée
+
+def _code_bits_table(codes):
+    # Tables indexées par octet : longueur du code, début du code dans flat_bits (bits de tous les codes bout à bout)
+    lengths = np.zeros(256, dtype=np.int64)
+    starts = np.zeros(256, dtype=np.int64)
+    flat_bits = []
+    for symbol, code in codes.items():
+        starts[symbol[0]] = len(flat_bits)
+        lengths[symbol[0]] = len(code)
+        flat_bits.extend(map(int, code))
+    return lengths, starts, np.array(flat_bits, dtype=np.uint8)
+
+def _pack_symbols(part, table, pending):
+    # Encoder un morceau non vide : renvoie les octets complets et les bits restants (moins de 8)
+    lengths, starts, flat_bits = table
+    part_lengths = lengths[part]
+    if not part_lengths.all():
+        raise ValueError("Octet absent de la table des codes.")
+    ends = np.cumsum(part_lengths)
+    # Position de chaque bit de sortie dans flat_bits : début du code + rang du bit dans le code
+    index = np.repeat(starts[part] - (ends - part_lengths), part_lengths) + np.arange(ends[-1])
+    bits = np.concatenate((pending, flat_bits[index]))
+    usable = len(bits) - len(bits) % 8
+    return np.packbits(bits[:usable]).tobytes(), bits[usable:]
+
+def pack_bits_numpy(symbols, codes, chunk_size=ENCODE_CHUNK_SIZE):
+    # Encoder un tableau uint8 : les bits de chaque code sont rassemblés par indexation puis empaquetés
+    table = _code_bits_table(codes)
+    pieces = []
+    pending = np.empty(0, dtype=np.uint8)  # Bits restants (moins de 8) en attente du morceau suivant
+    for i in range(0, len(symbols), chunk_size):
+        piece, pending = _pack_symbols(symbols[i:i + chunk_size], table, pending)
+        pieces.append(piece)
+    padding = -len(pending) % 8
+    if len(pending):
+        pieces.append(np.packbits(pending).tobytes())  # packbits complète le dernier octet avec des zéros
+    return b"".join(pieces), padding
+
+def compress_binary(data, codes=None):
+    # Compresser des octets quelconques (texte encodé, journaux...) sans perte
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    if codes is None:
+        codes = build_codes(calculate_frequency_bytes(data))
+    else:
+        codes = canonical_codes({symbol: len(code) for symbol, code in codes.items()})
+    payload, padding = pack_bits_numpy(symbols, codes)
+    return build_header(codes, padding, binary=True) + payload
+
+# --- Compression en flux (fichiers plus grands que la mémoire) ---
+CHUNK_SIZE = 1 << 20  # Nombre de caractères lus à chaque étape
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    # Accepter un fichier ouvert (méthode read) ou n'importe quel itérable de morceaux
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+def count_frequencies_stream(source, chunk_size=CHUNK_SIZE):
+    # Premier passage : compter les caractères (ou les octets, avec NumPy) morceau par morceau
+    frequencies = Counter()
+    for chunk in iter_chunks(source, chunk_size):
+        frequencies.update(chunk if isinstance(chunk, str) else calculate_frequency_bytes(chunk))
+    return dict(frequencies)
+
+def compress_stream(source, destination, frequencies=None, chunk_size=CHUNK_SIZE, metrics=None):
+    # Compresser un flux de texte vers un flux binaire avec une mémoire bornée
+    # Un flux d'octets (fichier ouvert en mode binaire, morceaux bytes) produit un conteneur d'octets, comme compress_binary
+    # Sans table de fréquences, la source doit être un fichier relisible (premier passage puis retour au début)
+    if frequencies is None:
+        if not hasattr(source, "seek"):
+            raise ValueError("Une table de fréquences est nécessaire pour compresser un itérable non relisible.")
+        with phase(metrics, "huffman.frequency"):
+            start = source.tell()
+            frequencies = count_frequencies_stream(source, chunk_size)
+            source.seek(start)
+    frequencies = {char: freq for char, freq in frequencies.items() if freq > 0}
+    codes = build_codes(frequencies, metrics)
+    with phase(metrics, "huffman.encode"):
+        bytes_written = _encode_stream(source, destination, frequencies, codes, chunk_size)
+    count(metrics, "huffman.output_bytes", bytes_written)
+    return bytes_written
+
+def _encode_stream(source, destination, frequencies, codes, chunk_size):
+    # Le bourrage se déduit des fréquences : il est connu avant d'écrire les données
+    total_bits = sum(freq * len(codes[char]) for char, freq in frequencies.items())
+    padding = -total_bits % 8
+    binary = _is_binary(codes)
+    header_position = destination.tell() if destination.seekable() else None
+    destination.write(build_header(codes, padding, binary=binary))
+    written = bytes_written = 0
+    if binary:
+        table = _code_bits_table(codes)
+        pending = np.empty(0, dtype=np.uint8)
+    else:
+        pending = ""  # Bits restants (moins de 8) en attente du morceau suivant
+    for chunk in iter_chunks(source, chunk_size):
+        if isinstance(chunk, str) == binary:
+            raise ValueError("Les morceaux du flux doivent être tous du texte ou tous des octets, comme la table de fréquences.")
+        if binary:
+            symbols = np.frombuffer(chunk, dtype=np.uint8)
+            for i in range(0, len(symbols), ENCODE_CHUNK_SIZE):
+                previous = len(pending)
+                piece, pending = _pack_symbols(symbols[i:i + ENCODE_CHUNK_SIZE], table, pending)
+                destination.write(piece)
+                bytes_written += len(piece)
+                written += len(piece) * 8 + len(pending) - previous
+            continue
+        try:
+            bits = pending + "".join(map(codes.__getitem__, chunk))
+        except KeyError as error:
+            raise ValueError(f"Caractère absent de la table de fréquences : {error.args[0]!r}") from None
+        usable = len(bits) - len(bits) % 8
+        if usable:
+            destination.write(int(bits[:usable], 2).to_bytes(usable // 8, "big"))
+            bytes_written += usable // 8
+        written += len(bits) - len(pending)
+        pending = bits[usable:]
+    if len(pending):
+        destination.write(np.packbits(pending).tobytes() if binary else int(pending.ljust(8, "0"), 2).to_bytes(1, "big"))
+        bytes_written += 1
+    # Table de fréquences approximative : corriger le bourrage dans l'en-tête si possible
+    if -written % 8 != padding:
+        if header_position is None:
+            raise ValueError("La table de fréquences ne correspond pas aux données et la destination n'est pas repositionnable.")
+        end = destination.tell()
+        destination.seek(header_position + len(MAGIC) + 1)
+        destination.write(bytes([-written % 8]))
+        destination.seek(end)
+    return bytes_written
+
+def decompress_stream(source, destination, chunk_size=CHUNK_SIZE, metrics=None):
+    # Décompresser un flux binaire vers un flux texte, morceau par morceau
+    # (vers un flux binaire pour un conteneur d'octets produit par compress_binary ou compress_stream sur des octets)
+    with phase(metrics, "huffman.decode"):
+        _decode_stream(source, destination, chunk_size)
+
+def _decode_stream(source, destination, chunk_size):
+    version, padding, codes = parse_header(source)
+    if not codes:
+        return
+    empty = next(iter(codes))[:0]  # "" pour du texte, b"" pour des octets
+    if version == FORMAT_CANONICAL_BYTES and isinstance(destination, io.TextIOBase):
+        raise ValueError("Conteneur d'octets (compress_binary) : la destination doit être un flux binaire.")
+    table, states = build_decode_table(codes)
+    state = 0
+    last = b""  # Le dernier octet est gardé de côté : c'est lui qui contient le bourrage
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        chunk = last + chunk
+        text, state = _decode_chunk(table, state, chunk[:-1], empty)
+        destination.write(text)
+        last = chunk[-1:]
+    if last:
+        destination.write(_decode_last_byte(states, state, last[0], padding, empty))
+
+# --- Compression par blocs indépendants (plusieurs cœurs) ---
+# Structure : MAGIC_BLOCKS | version (1 octet) | nombre de blocs (4 octets)
+#             | index (position et taille de chaque bloc, 8 + 8 octets) | blocs
+# Chaque bloc est un conteneur complet (avec sa propre table) : il se décompresse seul.
+MAGIC_BLOCKS = b"HUB"
+FORMAT_BLOCKS = 1
+BLOCK_SIZE = 1 << 20  # Nombre de caractères par bloc
+
+def _compress_block(text):
+    return compress_bytes(text, build_codes(Counter(text)))
+
+def _parallel_map(function, items, workers):
+    # workers=1 : exécution dans le processus courant (pas de coût de démarrage du pool)
+    if workers == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items))
+
+def compress_blocks(text, block_size=BLOCK_SIZE, workers=None):
+    # Découper le texte en blocs compressés en parallèle (workers=None : un processus par cœur)
+    blocks = [text[i:i + block_size] for i in range(0, len(text), block_size)]
+    compressed = _parallel_map(_compress_block, blocks, workers or os.cpu_count())
+    header = bytearray(MAGIC_BLOCKS)
+    header.append(FORMAT_BLOCKS)
+    header += len(compressed).to_bytes(4, "big")
+    offset = len(header) + 16 * len(compressed)
+    for block in compressed:
+        header += offset.to_bytes(8, "big") + len(block).to_bytes(8, "big")
+        offset += len(block)
+    return bytes(header) + b"".join(compressed)
+
+def read_block_index(data):
+    # Index des blocs : liste de (position, taille) dans le conteneur
+    if data[:len(MAGIC_BLOCKS)] != MAGIC_BLOCKS:
+        raise ValueError("Ce fichier n'est pas un fichier compressé par blocs valide.")
+    offset = len(MAGIC_BLOCKS)
+    if data[offset] != FORMAT_BLOCKS:
+        raise ValueError(f"Version de format inconnue : {data[offset]}")
+    block_count = int.from_bytes(data[offset + 1:offset + 5], "big")
+    offset += 5
+    index = []
+    for _ in range(block_count):
+        index.append((int.from_bytes(data[offset:offset + 8], "big"), int.from_bytes(data[offset + 8:offset + 16], "big")))
+        offset += 16
+    return index
+
+def decompress_block(data, block_number):
+    # Accès direct : décompresser un seul bloc sans lire les autres
+    offset, size = read_block_index(data)[block_number]
+    return decompress_bytes(data[offset:offset + size])
 
+def decompress_blocks(data, workers=None):
+    # Décompresser tous les blocs en parallèle puis les recoller dans l'ordre
+    blocks = [data[offset:offset + size] for offset, size in read_block_index(data)]
+    return "".join(_parallel_map(decompress_bytes, blocks, workers or os.cpu_count()))
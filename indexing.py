@@ -1,20 +1,70 @@
+import heapq
 import os
 from collections import defaultdict
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def create_inverted_index(folder_path):
+SHARDS_PER_WORKER = 4  # Plusieurs lots par processus : meilleur équilibrage et progression plus fine
+
+def _index_shard(folder_path, file_names):
+    # Index partiel d'un lot de fichiers : liste triée de (mot, noms de fichiers triés)
+    # nltk est importé ici (long à charger) : importer le module ne le charge pas
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
     stop_words = set(stopwords.words("english"))
-    inverted_index = defaultdict(list)
-    
-    for file_name in os.listdir(folder_path):
+    partial_index = defaultdict(list)
+    for file_name in sorted(file_names):
         file_path = os.path.join(folder_path, file_name)
         with open(file_path, 'r', encoding='utf-8') as f:
             text = f.read()
             words = word_tokenize(text.lower())
             words = [word for word in words if word.isalnum() and word not in stop_words]
-            
+
             for word in set(words):
-                inverted_index[word].append(file_name)
-    
+                partial_index[word].append(file_name)
+    return sorted(partial_index.items()), len(file_names)
+
+def merge_partial_indexes(partial_indexes):
+    # Fusion k-voies : les index partiels sont triés par mot, et chaque liste de postings est triée
+    inverted_index = defaultdict(list)
+    current_word = None
+    runs = []
+    for word, postings in heapq.merge(*partial_indexes, key=lambda item: item[0]):
+        if word != current_word and runs:
+            inverted_index[current_word] = list(heapq.merge(*runs))
+            runs = []
+        current_word = word
+        runs.append(postings)
+    if runs:
+        inverted_index[current_word] = list(heapq.merge(*runs))
     return inverted_index
+
+def create_inverted_index(folder_path, workers=1, progress=None):
+    # workers > 1 : les fichiers sont répartis en lots traités par un pool de processus
+    # progress(fichiers traités, total) est appelé après chaque lot
+    file_names = sorted(os.listdir(folder_path))
+    if workers == 1:
+        shards = [file_names]
+    else:
+        workers = workers or os.cpu_count()
+        shard_count = max(1, min(len(file_names), workers * SHARDS_PER_WORKER))
+        shards = [file_names[i::shard_count] for i in range(shard_count)]  # Répartition tournante
+
+    partial_indexes = []
+    done = 0
+    if workers == 1:
+        for shard in shards:
+            partial_index, count = _index_shard(folder_path, shard)
+            partial_indexes.append(partial_index)
+            done += count
+            if progress:
+                progress(done, len(file_names))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_index_shard, folder_path, shard) for shard in shards]
+            for future in as_completed(futures):
+                partial_index, count = future.result()
+                partial_indexes.append(partial_index)
+                done += count
+                if progress:
+                    progress(done, len(file_names))
+    return merge_partial_indexes(partial_indexes)
@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+
+# Instrumentation optionnelle des chemins critiques : durée cumulée et nombre d'appels par phase,
+# compteurs libres (nœuds fixés, entrées du tas...). Les fonctions instrumentées reçoivent metrics=None
+# par défaut : phase(None, ...) renvoie un contexte vide partagé, le coût se limite à un appel de fonction.
+# Les noms sont préfixés par le moteur : "search.postings", "huffman.encode", "dijkstra.settled"...
+
+class Metrics:
+    def __init__(self):
+        self.phases = {}  # Nom -> [secondes cumulées, appels]
+        self.counters = {}  # Nom -> valeur cumulée
+        self.lock = threading.Lock()  # Un même objet peut servir à plusieurs fils (moteur de recherche partagé)
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            entry = self.phases.get(name)
+            if entry is None:
+                self.phases[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self.lock:
+            self.phases.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        # Métriques structurées : {"phases": {nom: {"seconds", "calls"}}, "counters": {nom: valeur}}
+        with self.lock:
+            return {"phases": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in self.phases.items()},
+                    "counters": dict(self.counters)}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+class _Phase:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_PHASE = _NullPhase()
+
+def phase(metrics, name):
+    # with phase(metrics, "huffman.encode"): ... ; sans métriques, contexte vide sans mesure du temps
+    return NULL_PHASE if metrics is None else metrics.phase(name)
+
+def count(metrics, name, value=1):
+    if metrics is not None:
+        metrics.count(name, value)
@@ -0,0 +1,210 @@
+import sys
+from array import array
+from bisect import bisect_left
+
+# Listes de postings compactes pour l'index inversé :
+# - identifiants de documents entiers, triés et sans doublons
+# - codés par différences (deltas) en octets variables (7 bits utiles par octet)
+# - regroupés en blocs de BLOCK_SIZE avec un pointeur de saut par bloc (dernier identifiant + position)
+# - fréquences du terme dans chaque document stockées à côté dans un array('I')
+# - index positionnel optionnel : positions du terme dans chaque document, par deltas en octets variables
+
+BLOCK_SIZE = 128  # Nombre de postings par bloc
+END = 1 << 32  # Identifiant sentinelle : curseur épuisé
+
+def encode_varbyte(value, buffer):
+    # Écrire un entier positif en octets variables (bit de poids fort = suite)
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def decode_varbytes(buffer, start, count):
+    # Lire count entiers à partir de la position start ; retourne (valeurs, position suivante)
+    values = []
+    position = start
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = buffer[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(value)
+    return values, position
+
+class PostingList:
+    __slots__ = ("data", "tfs", "block_last", "block_offsets", "last_doc", "max_tf", "positions", "position_offsets")
+
+    def __init__(self, positional=False):
+        self.data = bytearray()  # Deltas des identifiants (octets variables)
+        self.tfs = array("I")  # Fréquence du terme dans chaque document
+        self.block_last = array("I")  # Dernier identifiant de chaque bloc (pointeurs de saut)
+        self.block_offsets = array("I")  # Début de chaque bloc dans data
+        self.last_doc = -1
+        self.max_tf = 0
+        self.positions = bytearray() if positional else None  # Deltas des positions de chaque posting
+        self.position_offsets = array("I") if positional else None  # Début des positions de chaque posting
+
+    @classmethod
+    def from_buffers(cls, data, tfs, block_last, block_offsets, max_tf, positions=None, position_offsets=None):
+        # Liste en lecture seule sur des tampons existants (par exemple un segment projeté en mémoire)
+        postings = cls.__new__(cls)
+        postings.data = data
+        postings.tfs = tfs
+        postings.block_last = block_last
+        postings.block_offsets = block_offsets
+        postings.last_doc = block_last[-1] if len(block_last) else -1
+        postings.max_tf = max_tf
+        postings.positions = positions
+        postings.position_offsets = position_offsets
+        return postings
+
+    @property
+    def frozen(self):
+        return not isinstance(self.data, bytearray)
+
+    def thaw(self):
+        # Copie modifiable d'une liste en lecture seule (copie à l'écriture)
+        if not self.frozen:
+            return self
+        positional = self.positions is not None
+        return PostingList.from_buffers(bytearray(self.data), array("I", self.tfs.tobytes()),
+                                        array("I", self.block_last.tobytes()), array("I", self.block_offsets.tobytes()),
+                                        self.max_tf,
+                                        bytearray(self.positions) if positional else None,
+                                        array("I", self.position_offsets.tobytes()) if positional else None)
+
+    def add(self, doc_id, tf, positions=None):
+        # positions : positions croissantes du terme dans le document (index positionnel uniquement)
+        # Les documents doivent arriver par identifiant croissant
+        if doc_id <= self.last_doc:
+            raise ValueError("Les identifiants de documents doivent être croissants.")
+        if len(self.tfs) % BLOCK_SIZE == 0:
+            # Nouveau bloc : le premier delta part du dernier identifiant du bloc précédent
+            self.block_offsets.append(len(self.data))
+            delta = doc_id - (self.block_last[-1] if self.block_last else 0)
+            self.block_last.append(doc_id)
+        else:
+            delta = doc_id - self.last_doc
+            self.block_last[-1] = doc_id
+        encode_varbyte(delta, self.data)
+        self.tfs.append(tf)
+        self.last_doc = doc_id
+        self.max_tf = max(self.max_tf, tf)
+        if self.positions is not None:
+            self.position_offsets.append(len(self.positions))
+            previous = 0
+            for position in positions:
+                encode_varbyte(position - previous, self.positions)
+                previous = position
+
+    def positions_at(self, index):
+        # Positions absolues du terme dans le document du posting numéro index
+        deltas, _ = decode_varbytes(self.positions, self.position_offsets[index], self.tfs[index])
+        positions = []
+        position = 0
+        for delta in deltas:
+            position += delta
+            positions.append(position)
+        return positions
+
+    def __len__(self):
+        return len(self.tfs)
+
+    @property
+    def nbytes(self):
+        # Mémoire occupée : objet, en-têtes et capacité allouée des tableaux
+        # (une liste lue dans un segment ne compte que ses vues : les pages projetées ne sont pas copiées)
+        buffers = (self.data, self.tfs, self.block_last, self.block_offsets, self.positions, self.position_offsets)
+        return sys.getsizeof(self) + sum(sys.getsizeof(buffer) for buffer in buffers if buffer is not None)
+
+    def decode_block(self, block):
+        # Identifiants absolus du bloc demandé
+        count = min(BLOCK_SIZE, len(self.tfs) - block * BLOCK_SIZE)
+        deltas, _ = decode_varbytes(self.data, self.block_offsets[block], count)
+        doc_id = self.block_last[block - 1] if block else 0
+        docs = []
+        for delta in deltas:
+            doc_id += delta
+            docs.append(doc_id)
+        return docs
+
+    def doc_ids(self):
+        for block in range(len(self.block_offsets)):
+            yield from self.decode_block(block)
+
+    def __iter__(self):
+        # Couples (identifiant, fréquence)
+        return zip(self.doc_ids(), self.tfs)
+
+class PostingCursor:
+    # Parcours d'une liste de postings avec saut vers un identifiant (advance)
+    __slots__ = ("postings", "block", "docs", "position", "doc", "decoded_blocks")
+
+    def __init__(self, postings, decoded_blocks=None):
+        # decoded_blocks : dictionnaire partagé (traitement par lots) des blocs déjà décodés
+        self.postings = postings
+        self.decoded_blocks = decoded_blocks
+        self.block = -1
+        self.docs = []
+        self.position = 0
+        self.doc = END
+        if len(postings):
+            self._load(0)
+
+    def _load(self, block):
+        self.block = block
+        if self.decoded_blocks is None:
+            self.docs = self.postings.decode_block(block)
+        else:
+            key = (id(self.postings), block)
+            docs = self.decoded_blocks.get(key)
+            if docs is None:
+                docs = self.decoded_blocks[key] = self.postings.decode_block(block)
+            self.docs = docs
+        self.position = 0
+        self.doc = self.docs[0]
+
+    def tf(self):
+        return self.postings.tfs[self.block * BLOCK_SIZE + self.position]
+
+    def positions(self):
+        return self.postings.positions_at(self.block * BLOCK_SIZE + self.position)
+
+    def next(self):
+        self.position += 1
+        if self.position < len(self.docs):
+            self.doc = self.docs[self.position]
+        elif self.block + 1 < len(self.postings.block_offsets):
+            self._load(self.block + 1)
+        else:
+            self.doc = END
+        return self.doc
+
+    def advance(self, target):
+        # Se placer sur le premier identifiant >= target
+        if self.doc >= target:
+            return self.doc
+        block_last = self.postings.block_last
+        if target > block_last[self.block]:
+            # Sauter directement au bloc qui peut contenir target
+            block = bisect_left(block_last, target, self.block + 1)
+            if block == len(block_last):
+                self.doc = END
+                return END
+            self._load(block)
+        # Recherche galopante dans le bloc : pas doublés depuis la position courante, puis dichotomie
+        docs = self.docs
+        low = self.position
+        step = 1
+        high = low + 1
+        while high < len(docs) and docs[high] < target:
+            low = high
+            step <<= 1
+            high = low + step
+        self.position = bisect_left(docs, target, low, min(high + 1, len(docs)))
+        self.doc = docs[self.position]
+        return self.doc
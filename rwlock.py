@@ -0,0 +1,41 @@
+import threading
+from contextlib import contextmanager
+
+class ReadWriteLock:
+    # Verrou lecteurs/rédacteur : plusieurs recherches en parallèle, une seule écriture à la fois.
+    # Un rédacteur en attente bloque les nouveaux lecteurs (pas de famine des écritures).
+    # Non réentrant : un lecteur ne doit pas reprendre le verrou en lecture.
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
@@ -1,49 +1,544 @@
+import heapq
+import math
 import os
-from collections import defaultdict, Counter
-from difflib import get_close_matches
+import re
+import sys
+import threading
+from array import array
+from cache import MISSING, LRUCache
+from collections import Counter
+from fuzzy import TrigramIndex, similar_words
+from instrumentation import count, phase
+from postings import END, PostingCursor, PostingList
+from rwlock import ReadWriteLock
+from segment import open_segment, write_segment
+
+# Paramètres du classement BM25
+BM25_K1 = 1.2  # Saturation de la fréquence du terme
+BM25_B = 0.75  # Poids de la normalisation par la longueur du document
+COMPACTION_RATIO = 0.2  # Part de documents supprimés qui déclenche un compactage en arrière-plan
+
+QUERY_CACHE_SIZE = 1024  # Nombre de requêtes gardées en cache (0 : cache désactivé)
+FUZZY_CACHE_SIZE = 4096  # Nombre d'expansions floues gardées en cache
+
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')  # Expression exacte entre guillemets ou mot isolé
+NEAR_OPERATOR = re.compile(r"NEAR/(\d+)$")  # mot1 NEAR/k mot2 : au plus k positions d'écart
+
+def parse_query(query):
+    # Découper la requête en clauses : ("mot", m), ("phrase", [m1, m2, ...]) ou ("near", m1, m2, k)
+    clauses = []
+    tokens = [(phrase, word) for phrase, word in QUERY_TOKEN.findall(query)]
+    i = 0
+    while i < len(tokens):
+        phrase, word = tokens[i]
+        near = NEAR_OPERATOR.match(word) if word else None
+        if near and clauses and clauses[-1][0] == "mot" and i + 1 < len(tokens) and tokens[i + 1][1]:
+            clauses[-1] = ("near", clauses[-1][1], tokens[i + 1][1].lower(), int(near.group(1)))
+            i += 2
+            continue
+        if word:
+            clauses.append(("mot", word.lower()))
+        else:
+            words = phrase.lower().split()
+            if len(words) == 1:
+                clauses.append(("mot", words[0]))
+            elif words:
+                clauses.append(("phrase", words))
+        i += 1
+    return clauses
+
+def intersect_sorted(first, second):
+    # Intersection de deux listes triées par fusion
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if first[i] < second[j]:
+            i += 1
+        elif first[i] > second[j]:
+            j += 1
+        else:
+            result.append(first[i])
+            i += 1
+            j += 1
+    return result
+
+def phrase_matches(position_lists):
+    # Le mot numéro i doit apparaître à la position p + i
+    candidates = position_lists[0]
+    for offset, positions in enumerate(position_lists[1:], 1):
+        candidates = intersect_sorted(candidates, [position - offset for position in positions])
+        if not candidates:
+            return False
+    return True
+
+def near_matches(distance):
+    def matches(position_lists):
+        # Deux pointeurs sur les positions triées : un écart <= distance suffit (dans un sens ou l'autre)
+        first, second = position_lists
+        i = j = 0
+        while i < len(first) and j < len(second):
+            if abs(first[i] - second[j]) <= distance:
+                return True
+            if first[i] < second[j]:
+                i += 1
+            else:
+                j += 1
+        return False
+    return matches
+
+class TermCursor:
+    # Curseur sur les postings d'un terme, capable de calculer la contribution BM25 du document courant
+    # document_frequency : documents vivants contenant le terme (les postings gardent les supprimés jusqu'au compactage)
+    def __init__(self, engine, postings, document_frequency, decoded_blocks=None):
+        self.cursor = PostingCursor(postings, decoded_blocks)
+        self.doc_lengths = engine.doc_lengths
+        self.size = len(postings)  # Coût du parcours (ordre des curseurs), supprimés compris
+        document_count = len(engine.doc_ids)  # Documents vivants uniquement
+        self.idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        self.average_length = engine.total_length / document_count if document_count else 0
+        # Borne supérieure de la contribution : fréquence maximale et longueur de document nulle
+        self.upper_bound = self.idf * postings.max_tf * (BM25_K1 + 1) / (postings.max_tf + BM25_K1 * (1 - BM25_B))
+
+    @property
+    def doc(self):
+        return self.cursor.doc
+
+    def next(self):
+        return self.cursor.next()
+
+    def advance(self, target):
+        return self.cursor.advance(target)
+
+    def positions(self):
+        return self.cursor.positions()
+
+    def score(self):
+        tf = self.cursor.tf()
+        norm = 1 - BM25_B + BM25_B * self.doc_lengths[self.cursor.doc] / self.average_length
+        return self.idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+class UnionCursor:
+    # Union de plusieurs termes (variantes floues d'un même mot) vue comme un seul curseur
+    def __init__(self, cursors):
+        self.cursors = cursors
+        self.size = sum(cursor.size for cursor in cursors)
+        self.upper_bound = sum(cursor.upper_bound for cursor in cursors)
+        self.doc = min(cursor.doc for cursor in cursors)
+
+    def next(self):
+        for cursor in self.cursors:
+            if cursor.doc == self.doc:
+                cursor.next()
+        self.doc = min(cursor.doc for cursor in self.cursors)
+        return self.doc
+
+    def advance(self, target):
+        if self.doc < target:
+            self.doc = min(cursor.advance(target) for cursor in self.cursors)
+        return self.doc
+
+    def score(self):
+        return sum(cursor.score() for cursor in self.cursors if cursor.doc == self.doc)
+
+class PositionalCursor:
+    # Documents contenant tous les termes et dont les positions vérifient une condition (expression, proximité)
+    def __init__(self, cursors, matches):
+        self.cursors = cursors  # Dans l'ordre de la requête (pour la condition sur les positions)
+        self.ordered = sorted(cursors, key=lambda cursor: cursor.size)  # La liste la plus courte mène
+        self.matches = matches
+        self.size = self.ordered[0].size
+        self.upper_bound = sum(cursor.upper_bound for cursor in cursors)
+        self.doc = self._align(self.ordered[0].doc)
+
+    def _align(self, doc_id):
+        lead, others = self.ordered[0], self.ordered[1:]
+        doc_id = lead.advance(doc_id)
+        while doc_id != END:
+            for cursor in others:
+                found = cursor.advance(doc_id)
+                if found != doc_id:
+                    doc_id = lead.advance(found)
+                    break
+            else:
+                if self.matches([cursor.positions() for cursor in self.cursors]):
+                    return doc_id
+                doc_id = lead.next()
+        return END
+
+    def next(self):
+        self.doc = self._align(self.ordered[0].next())
+        return self.doc
+
+    def advance(self, target):
+        if self.doc < target:
+            self.doc = self._align(target)
+        return self.doc
+
+    def score(self):
+        return sum(cursor.score() for cursor in self.cursors)
 
 class SearchEngine:
-    def __init__(self):
-        self.index = defaultdict(list)  # Index inversé
-        self.document_word_counts = defaultdict(Counter)  # Compte des mots dans chaque document
+    def __init__(self, positional=False, cache_size=QUERY_CACHE_SIZE, cache_ttl=None, metrics=None):
+        self.positional = positional  # Stocker les positions des mots (expressions exactes et NEAR/k)
+        # instrumentation.Metrics optionnel : durée des phases de l'indexation et des recherches. Un moteur partagé
+        # (cache Streamlit, serveur) reçoit plutôt metrics à chaque appel, qui remplace alors celui-ci
+        self.metrics = metrics
+        # Caches des résultats et des expansions floues ; chaque entrée garde la génération de l'index
+        # qui l'a produite et n'est plus servie dès que l'index change (generation incrémentée)
+        self.generation = 0
+        self.query_cache = LRUCache(cache_size, cache_ttl)
+        self.fuzzy_cache = LRUCache(FUZZY_CACHE_SIZE if cache_size else 0, cache_ttl)
+        self.index = {}  # Index inversé : mot -> PostingList (identifiants entiers triés + fréquences)
+        self.doc_ids = {}  # Nom du document -> identifiant entier
+        self.doc_names = []  # Identifiant entier -> nom du document
+        self.doc_lengths = array("I")  # Nombre de mots de chaque document
+        self.total_length = 0  # Somme des longueurs des documents vivants (longueur moyenne pour BM25)
+        self.deleted = bytearray()  # Pierres tombales : 1 si le document a été supprimé ou remplacé
+        self.pending_deletions = 0  # Documents supprimés dont les postings n'ont pas encore été purgés
+        # Identifiant -> termes du document (None une fois supprimé). Construit à la première suppression seulement :
+        # tant qu'aucun document n'est supprimé, l'index direct ne coûte rien
+        self.doc_terms = None
+        self.dead_postings = {}  # Terme -> postings de documents supprimés pas encore purgés
+        self.compaction_thread = None
+        self.compaction_lock = threading.Lock()  # Un seul compactage lancé à la fois
+        self.lock = ReadWriteLock()  # Recherches concurrentes, écritures (indexation, suppression, compactage) exclusives
+        self.fuzzy_index = TrigramIndex()  # Vocabulaire indexé par trigrammes pour la recherche floue (None : à construire)
+
+    @property
+    def nbytes(self):
+        # Estimation de la mémoire du moteur : index inversé (dictionnaire, termes, postings), tables par document,
+        # index direct, index de trigrammes et caches. Sert de coût aux caches bornés en mémoire.
+        with self.lock.read():
+            total = sys.getsizeof(self.index) + sum(sys.getsizeof(term) + postings.nbytes
+                                                    for term, postings in self.index.items())
+            total += (sys.getsizeof(self.doc_ids) + sys.getsizeof(self.doc_names) + sys.getsizeof(self.doc_lengths)
+                      + sys.getsizeof(self.deleted) + sum(sys.getsizeof(name) for name in self.doc_names))
+            if self.doc_terms is not None:
+                total += sys.getsizeof(self.doc_terms) + sum(sys.getsizeof(terms) for terms in self.doc_terms if terms)
+            total += sys.getsizeof(self.dead_postings)
+            if self.fuzzy_index is not None:
+                total += self.fuzzy_index.nbytes
+            for cache in (self.query_cache, self.fuzzy_cache):
+                total += sum(sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry[2])
+                             for key, entry in list(cache.entries.items()))
+            return total
 
-    def index_document(self, doc_id, content):
+    def save(self, path):
+        # Enregistrer l'index dans un segment immuable sur disque
+        write_segment(self, path)
+
+    @classmethod
+    def open(cls, path):
+        # Ouvrir un segment par projection mémoire : les postings sont lus à la demande dans le fichier,
+        # et les pages sont partagées entre les processus qui ouvrent le même segment
+        engine = cls()
+        (names, engine.doc_lengths, engine.deleted, engine.total_length, engine.index,
+         engine.positional) = open_segment(path)
+        engine.doc_names = names
+        engine.doc_ids = {name: internal_id for internal_id, name in enumerate(names) if not engine.deleted[internal_id]}
+        engine.pending_deletions = sum(engine.deleted)
+        engine.fuzzy_index = None  # Construit à la première recherche floue
+        if engine.pending_deletions:
+            engine._build_doc_terms()  # Pierres tombales déjà présentes : fréquences vivantes nécessaires dès maintenant
+        return engine
+
+    def _build_doc_terms(self):
+        # Index direct (document -> termes) et postings morts, reconstruits en un parcours de l'index inversé.
+        # Les listes partagent les chaînes des clés de l'index (internées) : une référence par posting, pas de copie
+        doc_terms = [None if dead else [] for dead in self.deleted]
+        dead_postings = {}
+        for term, postings in self.index.items():
+            term = sys.intern(term)
+            for doc_id, _ in postings:
+                if self.deleted[doc_id]:
+                    dead_postings[term] = dead_postings.get(term, 0) + 1
+                else:
+                    doc_terms[doc_id].append(term)
+        self.doc_terms, self.dead_postings = doc_terms, dead_postings
+
+    def document_frequency(self, term, postings):
+        # Nombre de documents vivants contenant le terme (idf et bornes de BM25)
+        return len(postings) - self.dead_postings.get(term, 0)
+
+    def index_document(self, doc_id, content, metrics=None):
+        with self.lock.write(), phase(metrics or self.metrics, "search.index_document"):
+            self._index_document(doc_id, content)
+        self._maybe_compact()
+
+    def update_document(self, doc_id, content):
+        # Remplacer un document : l'ancienne version devient une pierre tombale, la nouvelle reçoit un nouvel identifiant
+        self.index_document(doc_id, content)
+
+    def delete_document(self, doc_id):
+        with self.lock.write():
+            self._delete_document(doc_id)
+        self._maybe_compact()
+
+    def _delete_document(self, doc_id):
+        # Suppression immédiate pour la recherche ; les postings morts sont purgés plus tard par compact()
+        internal_id = self.doc_ids.pop(doc_id)
+        if self.doc_terms is None:
+            self._build_doc_terms()
+        for term in self.doc_terms[internal_id]:
+            self.dead_postings[term] = self.dead_postings.get(term, 0) + 1
+        self.doc_terms[internal_id] = None
+        self.generation += 1
+        self.deleted[internal_id] = 1
+        self.total_length -= self.doc_lengths[internal_id]
+        self.pending_deletions += 1
+
+    def _index_document(self, doc_id, content):
         words = content.lower().split()
-        for word in words:
-            self.index[word].append(doc_id)
-        self.document_word_counts[doc_id].update(words)
-
-    def search(self, query, operator="ET", fuzzy=False):
-        query_words = query.lower().split()
-        results = None
-
-        for word in query_words:
-            if fuzzy:
-                similar_words = self.find_similar_words(word)
-                matching_docs = set(
-                    doc_id for similar_word in similar_words for doc_id in self.index.get(similar_word, [])
-                )
+        if doc_id in self.doc_ids:  # Document déjà indexé : mise à jour au lieu de doubler ses postings
+            self._delete_document(doc_id)
+        self.generation += 1
+        # Identifiants attribués dans l'ordre d'indexation : les postings restent triés sans effort
+        internal_id = len(self.doc_names)
+        self.doc_ids[doc_id] = internal_id
+        self.doc_names.append(doc_id)
+        self.doc_lengths.append(len(words))
+        self.deleted.append(0)
+        self.total_length += len(words)
+        # Un seul posting par (mot, document), avec le nombre d'occurrences (et les positions si demandé)
+        if self.positional:
+            word_positions = {}
+            for position, word in enumerate(words):
+                word_positions.setdefault(word, []).append(position)
+        else:
+            word_positions = Counter(words)
+        if self.doc_terms is not None:
+            self.doc_terms.append([sys.intern(word) for word in word_positions])
+        for word, positions in word_positions.items():
+            postings = self.index.get(word)
+            if postings is None:
+                postings = self.index[sys.intern(word)] = PostingList(self.positional)  # Clé partagée avec doc_terms
+                if self.fuzzy_index is not None:
+                    self.fuzzy_index.add(word)
+            elif postings.frozen:  # Liste lue dans un segment : copie modifiable avant ajout
+                postings = self.index[word] = postings.thaw()
+            if self.positional:
+                postings.add(internal_id, len(positions), positions)
             else:
-                matching_docs = set(self.index.get(word, []))
-
-            if results is None:
-                results = matching_docs
-            elif operator == "ET":
-                results.intersection_update(matching_docs)
-            elif operator == "OU":
-                results.update(matching_docs)
-
-        return self.rank_results(query_words, results) if results else []
-
-    def rank_results(self, query_words, results):
-        relevance_scores = {}
-        for doc_id in results:
-            relevance_scores[doc_id] = sum(
-                self.document_word_counts[doc_id][word] for word in query_words if word in self.document_word_counts[doc_id]
-            )
-        ranked_results = sorted(relevance_scores.items(), key=lambda x: x[1], reverse=True)
-        return [doc_id for doc_id, _ in ranked_results]
+                postings.add(internal_id, positions)
+
+    def search(self, query, operator="ET", fuzzy=False, top_k=None, metrics=None):
+        # top_k=None : tous les documents trouvés, classés ; sinon les top_k meilleurs seulement
+        # Requête : mots, expressions exactes entre guillemets et proximité (mot1 NEAR/k mot2)
+        with self.lock.read():
+            return list(self._cached_search(query, operator, fuzzy, top_k, metrics=metrics or self.metrics))
+
+    def search_many(self, queries, operator="ET", fuzzy=False, top_k=None, metrics=None):
+        # Traitement par lots : un seul verrou en lecture, requêtes identiques calculées une fois,
+        # postings et blocs décodés partagés entre toutes les requêtes du lot
+        shared = {"postings": {}, "blocks": {}}
+        results = {}
+        with self.lock.read():
+            for query in queries:
+                if query not in results:
+                    results[query] = self._cached_search(query, operator, fuzzy, top_k, shared, metrics or self.metrics)
+        return [list(results[query]) for query in queries]
+
+    def _cached_search(self, query, operator, fuzzy, top_k, shared=None, metrics=None):
+        with phase(metrics, "search.tokenize"):
+            clauses = parse_query(query)
+        key = (tuple(tuple(part) if isinstance(part, list) else part for clause in clauses for part in clause),
+               operator, fuzzy, top_k)
+        generation = self.generation
+        cached = self.query_cache.get(key, generation)
+        if cached is not MISSING:
+            count(metrics, "search.cache_hits")
+            return cached
+        count(metrics, "search.cache_misses")
+        results = self._search(clauses, operator, fuzzy, top_k, shared, metrics)
+        self.query_cache.put(key, results, generation)
+        return results
+
+    def cache_stats(self):
+        # Compteurs des caches (succès, échecs, taille) pour la supervision
+        return {"requêtes": self.query_cache.stats(), "recherche floue": self.fuzzy_cache.stats()}
+
+    def _lookup(self, term, shared, metrics=None):
+        # Postings d'un terme (ou None) ; en lot, chaque terme n'est cherché qu'une fois
+        with phase(metrics, "search.postings"):
+            if shared is None:
+                return self.index.get(term)
+            if term not in shared["postings"]:
+                shared["postings"][term] = self.index.get(term)
+            return shared["postings"][term]
+
+    def _cursor(self, term, postings, shared):
+        return TermCursor(self, postings, self.document_frequency(term, postings),
+                          shared["blocks"] if shared is not None else None)
+
+    def _search(self, clauses, operator, fuzzy, top_k, shared=None, metrics=None):
+        groups = {}  # Clé de la clause -> curseurs (plusieurs pour les variantes floues d'un mot)
+        for clause in clauses:
+            if clause[0] != "mot" and not self.positional:
+                # Sans index positionnel, expressions et NEAR/k se réduisent à leurs mots
+                words = clause[1] if clause[0] == "phrase" else clause[1:3]
+                for word in words:
+                    groups.setdefault(("mot", word), self._word_cursors(word, fuzzy, shared, metrics))
+            elif clause[0] == "mot":
+                groups.setdefault(clause, self._word_cursors(clause[1], fuzzy, shared, metrics))
+            else:
+                words = clause[1] if clause[0] == "phrase" else clause[1:3]
+                matches = phrase_matches if clause[0] == "phrase" else near_matches(clause[3])
+                key = (clause[0], tuple(words)) + tuple(clause[3:])
+                postings = [self._lookup(word, shared, metrics) for word in words]
+                if all(term is not None for term in postings):
+                    groups.setdefault(key, [PositionalCursor([self._cursor(word, term, shared) for word, term in zip(words, postings)],
+                                                             matches)])
+                else:
+                    groups.setdefault(key, [])
+
+        # Parcours document par document : les scores BM25 sont calculés pendant l'intersection,
+        # la phase de classement ne compte que le tri final du tas
+        if operator == "ET":
+            if not groups or not all(groups.values()):
+                return []
+            with phase(metrics, "search.intersection"):
+                heap = self._search_all(
+                    [group[0] if len(group) == 1 else UnionCursor(group) for group in groups.values()], top_k)
+        else:
+            # OU : chaque terme distinct est un curseur indépendant
+            cursors = {}
+            for key, group in groups.items():
+                if key[0] == "mot":
+                    cursors.update((id(cursor.cursor.postings), cursor) for cursor in group)
+                else:
+                    cursors.update((key, cursor) for cursor in group)
+            with phase(metrics, "search.intersection"):
+                heap = self._search_any(list(cursors.values()), top_k)
+        with phase(metrics, "search.ranking"):
+            results = [self.doc_names[doc_id] for doc_id in self._ranked(heap)]
+        count(metrics, "search.results", len(results))
+        return results
+
+    def _word_cursors(self, word, fuzzy, shared=None, metrics=None):
+        if fuzzy:
+            with phase(metrics, "search.fuzzy"):
+                terms = self.find_similar_words(word)
+        else:
+            terms = [word]
+        postings = [self._lookup(term, shared, metrics) for term in terms]
+        return [self._cursor(term, term_postings, shared) for term, term_postings in zip(terms, postings)
+                if term_postings is not None]
+
+    def compact(self):
+        # Purger les postings des documents supprimés, terme par terme ; chaque liste est remplacée
+        # d'un bloc, les recherches en cours continuent sur l'ancienne ou la nouvelle version
+        # Seules les suppressions comptées au départ sont retirées de pending_deletions : celles qui surviennent
+        # pendant le passage sur des termes déjà traités restent en attente et relanceront un compactage
+        with self.lock.write():
+            purged = self.pending_deletions
+        deleted = self.deleted
+        for term in list(self.index):
+            with self.lock.write():
+                postings = self.index.get(term)
+                if postings is None:
+                    continue
+                live = [(index, doc_id, tf) for index, (doc_id, tf) in enumerate(postings) if not deleted[doc_id]]
+                if len(live) == len(postings):
+                    continue
+                self.dead_postings.pop(term, None)  # Tous les postings morts du terme sont purgés sous le verrou
+                if not live:
+                    del self.index[term]
+                    continue
+                positional = postings.positions is not None
+                compacted = PostingList(positional)
+                for index, doc_id, tf in live:
+                    compacted.add(doc_id, tf, postings.positions_at(index) if positional else None)
+                self.index[term] = compacted
+        with self.lock.write():
+            self.pending_deletions -= purged
+            self.generation += 1  # Les fréquences de documents ont changé : scores BM25 différents
+
+    def _maybe_compact(self):
+        # Compactage en arrière-plan dès que la part de documents supprimés dépasse le seuil
+        with self.compaction_lock:  # Vérification et lancement atomiques : jamais deux compactages en parallèle
+            if self.pending_deletions <= COMPACTION_RATIO * max(len(self.doc_names), 1):
+                return
+            if self.compaction_thread is not None and self.compaction_thread.is_alive():
+                return
+            self.compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self.compaction_thread.start()
+
+    def _push(self, heap, score, doc_id, top_k):
+        # Tas borné aux top_k meilleurs (score, -identifiant) : à score égal, le plus petit identifiant gagne
+        if top_k is None or len(heap) < top_k:
+            heapq.heappush(heap, (score, -doc_id))
+        elif (score, -doc_id) > heap[0]:
+            heapq.heapreplace(heap, (score, -doc_id))
+
+    def _ranked(self, heap):
+        return [-negative_id for _, negative_id in sorted(heap, reverse=True)]
+
+    def _search_all(self, cursors, top_k):
+        # ET : la liste la plus courte mène, les autres sautent directement vers son document courant
+        cursors.sort(key=lambda cursor: cursor.size)
+        lead, others = cursors[0], cursors[1:]
+        heap = []
+        doc_id = lead.doc
+        while doc_id != END:
+            for cursor in others:
+                found = cursor.advance(doc_id)
+                if found != doc_id:
+                    doc_id = lead.advance(found)
+                    break
+            else:
+                if not self.deleted[doc_id]:
+                    self._push(heap, sum(cursor.score() for cursor in cursors), doc_id, top_k)
+                doc_id = lead.next()
+        return heap
+
+    def _search_any(self, cursors, top_k):
+        # OU avec élagage MaxScore : les termes dont la borne cumulée ne peut plus dépasser
+        # le seuil du tas ne servent plus à proposer des candidats, seulement à compléter leur score
+        cursors.sort(key=lambda cursor: cursor.upper_bound)
+        cumulative_bounds = []
+        total = 0
+        for cursor in cursors:
+            total += cursor.upper_bound
+            cumulative_bounds.append(total)
+        heap = []
+        threshold = 0
+        first_essential = 0
+        while first_essential < len(cursors):
+            essential = cursors[first_essential:]
+            doc_id = min(cursor.doc for cursor in essential)
+            if doc_id == END:
+                break
+            if self.deleted[doc_id]:
+                for cursor in essential:
+                    if cursor.doc == doc_id:
+                        cursor.next()
+                continue
+            score = 0
+            for cursor in essential:
+                if cursor.doc == doc_id:
+                    score += cursor.score()
+                    cursor.next()
+            for i in range(first_essential - 1, -1, -1):
+                if score + cumulative_bounds[i] <= threshold:
+                    break
+                if cursors[i].advance(doc_id) == doc_id:
+                    score += cursors[i].score()
+            if score > threshold or top_k is None or len(heap) < top_k:
+                self._push(heap, score, doc_id, top_k)
+                if top_k is not None and len(heap) == top_k:
+                    threshold = heap[0][0]
+                    while first_essential < len(cursors) and cumulative_bounds[first_essential] <= threshold:
+                        first_essential += 1
+        return heap
 
     def find_similar_words(self, word, cutoff=0.8):
-        return get_close_matches(word, self.index.keys(), n=5, cutoff=cutoff)
-  
+        # L'expansion floue est l'étape la plus coûteuse d'une requête : elle a son propre cache
+        generation = self.generation
+        cached = self.fuzzy_cache.get((word, cutoff), generation)
+        if cached is not MISSING:
+            return list(cached)
+        if self.fuzzy_index is None:
+            self.fuzzy_index = TrigramIndex(self.index)
+        words = similar_words(self.fuzzy_index, word, cutoff=cutoff, n=5)
+        self.fuzzy_cache.put((word, cutoff), words, generation)
+        return list(words)
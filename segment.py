@@ -0,0 +1,177 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from postings import PostingList
+
+# Segment d'index sur disque, immuable, ouvert par projection mémoire (mmap).
+# Structure :
+#   en-tête | noms des documents | longueurs des documents | documents supprimés | dictionnaire des termes (entrées de taille
+#   fixe, triées) | textes des termes | postings (deltas, fréquences, pointeurs de saut, positions)
+# Le dictionnaire est trié par terme (octets UTF-8) : une recherche dichotomique dans le fichier projeté
+# suffit, sans charger le vocabulaire. Les postings sont lus directement dans le tampon projeté.
+
+MAGIC = b"ALGOSEG"
+VERSION = 3  # Version 2 : table des documents supprimés ; version 3 : positions (index positionnel)
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1  # Les tableaux sont écrits dans l'ordre natif
+HEADER = struct.Struct("=7sBBBIIQQQQQQQ")  # magic, version, ordre, positionnel, documents, termes, total des longueurs, positions des sections
+ENTRY = struct.Struct("=QIIIIQIQ")  # texte (position, taille), postings, fréquence max, blocs, données (position, taille), taille des positions
+
+def _align(handle):
+    # Aligner la position d'écriture sur 4 octets pour les tableaux d'entiers
+    handle.write(b"\0" * (-handle.tell() % 4))
+
+def write_segment(engine, path):
+    # Écrire l'index dans un fichier temporaire puis le renommer : un segment n'est jamais modifié sur place
+    terms = sorted(engine.index, key=lambda term: term.encode("utf-8"))
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as handle:
+        handle.write(b"\0" * HEADER.size)
+        names_offset = handle.tell()
+        for name in engine.doc_names:
+            encoded = str(name).encode("utf-8")
+            handle.write(struct.pack("=I", len(encoded)) + encoded)
+        _align(handle)
+        lengths_offset = handle.tell()
+        handle.write(engine.doc_lengths.tobytes())
+        deleted_offset = handle.tell()
+        handle.write(bytes(engine.deleted))
+        _align(handle)  # Un octet par document : les postings du premier terme doivent rester alignés
+        # Postings de chaque terme, puis dictionnaire et textes des termes
+        entries = []
+        for term in terms:
+            postings = engine.index[term]
+            data_offset = handle.tell()
+            handle.write(bytes(postings.data))
+            _align(handle)
+            for values in (postings.tfs, postings.block_last, postings.block_offsets):
+                handle.write(values.tobytes())
+            positions_size = 0
+            if postings.positions is not None:
+                handle.write(postings.position_offsets.tobytes())
+                handle.write(bytes(postings.positions))
+                positions_size = len(postings.positions)
+                _align(handle)
+            entries.append((len(postings), postings.max_tf, len(postings.block_last), data_offset, len(postings.data),
+                            positions_size))
+        dictionary_offset = handle.tell()
+        terms_offset = dictionary_offset + ENTRY.size * len(terms)
+        text_offset = terms_offset
+        for term, entry in zip(terms, entries):
+            size = len(term.encode("utf-8"))
+            handle.write(ENTRY.pack(text_offset, size, *entry))
+            text_offset += size
+        for term in terms:
+            handle.write(term.encode("utf-8"))
+        handle.seek(0)
+        handle.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, engine.positional, len(engine.doc_names), len(terms), engine.total_length,
+                                 names_offset, lengths_offset, deleted_offset, dictionary_offset, terms_offset,
+                                 text_offset))
+    os.replace(temporary_path, path)
+
+class SegmentTerms(MutableMapping):
+    # Dictionnaire terme -> PostingList adossé au segment projeté ; les écritures vont dans une surcouche
+    # en mémoire (copie à l'écriture), le segment lui-même reste intact
+    def __init__(self, buffer, count, dictionary_offset):
+        self.buffer = buffer
+        self.count = count
+        self.dictionary_offset = dictionary_offset
+        self.overlay = {}  # Termes ajoutés ou modifiés depuis l'ouverture
+        self.removed = set()  # Termes du segment supprimés depuis l'ouverture
+
+    def _entry(self, position):
+        return ENTRY.unpack_from(self.buffer, self.dictionary_offset + position * ENTRY.size)
+
+    def _term_at(self, position):
+        text_offset, size = self._entry(position)[:2]
+        return bytes(self.buffer[text_offset:text_offset + size])
+
+    def _find(self, term):
+        # Recherche dichotomique dans le dictionnaire trié
+        key = term.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._term_at(low) == key:
+            return low
+        return None
+
+    def _postings(self, position):
+        _, _, count, max_tf, blocks, data_offset, data_size, positions_size = self._entry(position)
+        data = self.buffer[data_offset:data_offset + data_size]
+        start = data_offset + data_size + (-data_size % 4)
+        tfs = self.buffer[start:start + 4 * count].cast("I")
+        start += 4 * count
+        block_last = self.buffer[start:start + 4 * blocks].cast("I")
+        start += 4 * blocks
+        block_offsets = self.buffer[start:start + 4 * blocks].cast("I")
+        if not positions_size:
+            return PostingList.from_buffers(data, tfs, block_last, block_offsets, max_tf)
+        start += 4 * blocks
+        position_offsets = self.buffer[start:start + 4 * count].cast("I")
+        start += 4 * count
+        positions = self.buffer[start:start + positions_size]
+        return PostingList.from_buffers(data, tfs, block_last, block_offsets, max_tf, positions, position_offsets)
+
+    def __getitem__(self, term):
+        if term in self.overlay:
+            return self.overlay[term]
+        if term in self.removed:
+            raise KeyError(term)
+        position = self._find(term)
+        if position is None:
+            raise KeyError(term)
+        return self._postings(position)
+
+    def __setitem__(self, term, postings):
+        self.removed.discard(term)
+        self.overlay[term] = postings
+
+    def __delitem__(self, term):
+        if term in self.overlay:
+            del self.overlay[term]
+            if self._find(term) is not None:
+                self.removed.add(term)
+        elif term in self.removed or self._find(term) is None:
+            raise KeyError(term)
+        else:
+            self.removed.add(term)
+
+    def __iter__(self):
+        yield from self.overlay
+        for position in range(self.count):
+            term = self._term_at(position).decode("utf-8")
+            if term not in self.overlay and term not in self.removed:
+                yield term
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+def open_segment(path):
+    # Projeter le segment en mémoire : retourne (noms, longueurs, supprimés, total des longueurs, termes, positionnel)
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    (magic, version, byte_order, positional, doc_count, term_count, total_length,
+     names_offset, lengths_offset, deleted_offset, dictionary_offset, _, _) = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas un segment d'index valide.")
+    if version != VERSION:
+        raise ValueError(f"Version de segment inconnue : {version}")
+    if byte_order != BYTE_ORDER:
+        raise ValueError("Segment écrit sur une machine d'ordre des octets différent.")
+    names = []
+    position = names_offset
+    for _ in range(doc_count):
+        (size,) = struct.unpack_from("=I", buffer, position)
+        names.append(bytes(buffer[position + 4:position + 4 + size]).decode("utf-8"))
+        position += 4 + size
+    lengths = array("I", buffer[lengths_offset:lengths_offset + 4 * doc_count].tobytes())
+    deleted = bytearray(buffer[deleted_offset:deleted_offset + doc_count])
+    return names, lengths, deleted, total_length, SegmentTerms(buffer, term_count, dictionary_offset), bool(positional)